@@ -1,44 +1,33 @@
+import multiprocessing
 import threading
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import filedialog, messagebox, Toplevel, Scale, HORIZONTAL
-import cv2
-from PIL import Image, ImageTk
 import time
 import queue
 import json
 import os
-from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from db import init_db, engine
-from sqlalchemy.orm import sessionmaker
-init_db()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-db = SessionLocal()
-
-SETTINGS_FILE = "settings.json"
-default_settings = {
-    "history": 500,
-    "varThreshold": 25,
-    "min_contour_area": 1000,
-    "max_disappear_time": 1.0,
-    "min_visible_time": 1.0
-}
-
-settings = default_settings.copy()
-
-if os.path.exists(SETTINGS_FILE):
-    with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-        settings = json.load(f)
-else:
-    settings = default_settings.copy()
+from config import SETTINGS_FILE, default_settings, load_settings, video_roi
+
+# Важкі модулі (cv2, numpy, matplotlib, SQLAlchemy) імпортуються при першому використанні:
+# matplotlib - при відкритті статистики, cv2 та БД - при запуску обробки.
+
+settings = None  # Зчитуються в create_gui()
 tracked_data = {}
 is_playing = False
 stop_event = threading.Event()
 data_queue = queue.Queue()
+UI_TICK_MS = 100  # Період оновлення таблиці результатів
+MAX_TABLE_ROWS = 500  # Більше рядків - витісняються об'єкти, що найдовше не оновлювались
+DISPLAY_FPS = 25  # Верхня межа частоти оновлення відео на екрані (не впливає на аналіз)
 canvas_widget = None
 ax = None
+lod_plot = None  # plotting.DecimatedPlot поточного графіка
+preview_path = None  # Відео, відкрите для перегляду позиції
+preview_cap = None
+preview_index = None  # frameindex.FrameIndex цього відео
+preview_display = None
+SCRUB_DELAY_MS = 50  # Кадр позиції декодується лише після паузи в русі повзунка
 x_press, y_press = None, None
 is_dragging = False
 
@@ -62,6 +51,9 @@ def save_settings():
 
 
 def create_gui():
+    global settings
+    settings = load_settings()
+
     def open_statistics():
         stats_window = Toplevel(app)
         stats_window.title("Статистика")
@@ -82,13 +74,18 @@ def create_gui():
             ttk.Radiobutton(stats_window, text=text, variable=selected_graph, value=text).pack(anchor="w", padx=20)
 
         def select_json_and_plot():
-            file_path = filedialog.askopenfilename(filetypes=[("JSON Files", "*.json")], parent=stats_window)
+            from columnar import INDEX_FILE, TrackReader, load_tracked_data
+
+            file_path = filedialog.askopenfilename(
+                filetypes=[("JSON Files", "*.json"), ("Track Data", INDEX_FILE)], parent=stats_window)
             if not file_path:
                 return
 
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                if os.path.isdir(file_path) or os.path.basename(file_path) == INDEX_FILE:
+                    data = TrackReader(file_path)  # Стовпці читаються напряму, без словників на кожен рядок
+                else:
+                    data = load_tracked_data(file_path)
             except json.JSONDecodeError:
                 show_error_message("Помилка", "Файл містить некоректні JSON-дані.")
                 return
@@ -101,43 +98,50 @@ def create_gui():
             pady=20)
 
     def plot_graph(data, graph_type):
-        global canvas_widget, ax
+        global canvas_widget, ax, lod_plot
+        import numpy as np
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from columnar import TrackReader
+        from plotting import MARKER_MAX_POINTS, MAX_LEGEND_ENTRIES, DecimatedPlot, decimate_path, series_arrays
+
         video_label.pack_forget()
         if canvas_widget:
             canvas_widget.get_tk_widget().destroy()
 
         fig, ax = plt.subplots(figsize=(7, 5))
+        lod_plot = None
+        show_legend = len(data.object_ids if isinstance(data, TrackReader) else data) <= MAX_LEGEND_ENTRIES
 
         if graph_type in ["displacement_mm", "average_velocity_mm_s"]:
-            for obj_id, entries in data.items():
-                frames = [entry["frame"] for entry in entries]
-                values = [entry[graph_type] for entry in entries]
-                ax.plot(frames, values, marker='o', label=obj_id)
+            lod_plot = DecimatedPlot(ax)  # Лише видимий діапазон, проріджений до ширини осей
+            for obj_id, frames, values in series_arrays(data, "frame", graph_type):
+                lod_plot.plot(frames, values, label=obj_id)
 
             ax.set_xlabel("Кадри")
             ax.set_ylabel("Переміщення (мм)" if graph_type == "displacement_mm" else "Швидкість (мм/с)")
             ax.set_title("Статистика об'єктів")
-            ax.legend()
+            if show_legend:
+                ax.legend()
             ax.grid(True)
 
         elif graph_type == "trajectory":
-            for obj_id, entries in data.items():
-                x_values = [entry["x_mm"] for entry in entries]
-                y_values = [entry["y_mm"] for entry in entries]
-                ax.plot(x_values, y_values, marker='o', linestyle='-', label=obj_id)
+            for obj_id, x_values, y_values in series_arrays(data, "x_mm", "y_mm"):
+                x_values, y_values = decimate_path(x_values, y_values)
+                ax.plot(x_values, y_values, marker='o' if len(x_values) <= MARKER_MAX_POINTS else '',
+                        linestyle='-', label=obj_id)
 
             ax.set_xlabel("Координата X (мм)")
             ax.set_ylabel("Координата Y (мм)")
             ax.set_title("Траєкторія руху об'єктів")
-            ax.legend()
+            if show_legend:
+                ax.legend()
             ax.grid(True)
 
         elif graph_type in ["hist_velocity", "hist_displacement"]:
-            all_values = []
-            for obj_id, entries in data.items():
-                all_values.extend(
-                    [entry["average_velocity_mm_s"] if graph_type == "hist_velocity" else entry["displacement_mm"]
-                     for entry in entries])
+            key = "average_velocity_mm_s" if graph_type == "hist_velocity" else "displacement_mm"
+            all_values = [values for _, _, values in series_arrays(data, "frame", key)]
+            all_values = np.concatenate(all_values) if all_values else []
 
             ax.hist(all_values, bins=10, alpha=0.7, color='b', edgecolor='black')
             ax.set_xlabel("Швидкість (мм/с)" if graph_type == "hist_velocity" else "Переміщення (мм)")
@@ -165,7 +169,14 @@ def create_gui():
         ax.set_xlim([x_min * scale_factor, x_max * scale_factor])
         ax.set_ylim([y_min * scale_factor, y_max * scale_factor])
 
-        ax.figure.canvas.draw_idle()
+        redraw_plot()
+
+    def redraw_plot():
+        """Після зміни меж осей: для ліній з рівнями деталізації - блітинг, інакше - повне перемальовування."""
+        if lod_plot is not None and lod_plot.ax is ax:
+            lod_plot.update_view()
+        else:
+            ax.figure.canvas.draw_idle()
 
     def on_press(event):
         global x_press, y_press, is_dragging
@@ -190,7 +201,7 @@ def create_gui():
         ax.set_xlim([x_min + dx, x_max + dx])
         ax.set_ylim([y_min + dy, y_max + dy])
 
-        ax.figure.canvas.draw_idle()
+        redraw_plot()
 
     def on_release(event):
         global is_dragging
@@ -209,7 +220,7 @@ def create_gui():
         """Відкриває вікно налаштувань."""
         settings_window = Toplevel(app)
         settings_window.title("Налаштування")
-        settings_window.geometry("500x300")
+        settings_window.geometry("500x340")
         settings_window.attributes('-topmost', True)
 
         def update_setting(key, value):
@@ -253,6 +264,7 @@ def create_gui():
         create_setting_row("Довжина історії:", "history", 100, 2000, 100, "Чутливість до старих об'єктів")
         create_setting_row("Поріг руху:", "varThreshold", 10, 100, 1, "Від 10 - дуже чутливий")
         create_setting_row("Мін. площа (px²):", "min_contour_area", 500, 5000, 100, "Фільтр дрібних об'єктів")
+        create_setting_row("Пропуск статики:", "motion_threshold", 0, 30, 1, "0 - вимкнено")
 
         def reset_settings():
             global settings
@@ -279,82 +291,148 @@ def create_gui():
             show_warning_message("Увага", "Немає даних для збереження!")
             return
 
-        filepath = file_entry.get()
+        filepath = file_entry.get().strip()
         if not filepath:
-            show_warning_message("Помилка", "Будь ласка, виберіть відеофайл.")
+            show_warning_message("Помилка", "Будь ласка, виберіть відеофайл або вкажіть камеру / URL потоку.")
             return
 
-        video_name = filepath.split("/")[-1].split("\\")[-1].rsplit(".", 1)[0]
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{video_name}_{timestamp}.json"
+        from processor import result_filename, save_tracked_data
+
+        filename = result_filename(filepath)
 
         try:
-            with open(filename, "w", encoding="utf-8") as json_file:
-                json.dump(tracked_data, json_file, indent=4, ensure_ascii=False)
+            save_tracked_data(tracked_data, filename)
             show_info_message("Збережено", f"Дані успішно збережені у файл: {filename}")
         except Exception as e:
             show_error_message("Помилка", f"Не вдалося зберегти дані.\n{str(e)}")
 
 
-    def update_table_worker():
+    table_rows = {}  # obj_id -> iid рядка таблиці
+    row_frames = {}  # obj_id -> кадр останнього оновлення рядка
 
-        while True:  # Без перевірки stop_event
+    def poll_table_updates():
+        """Раз на UI_TICK_MS забирає всі оновлення з черги й застосовує лише останнє для кожного об'єкта."""
+        pending = {}
+        while True:
             try:
-                objects, frame_count, elapsed_time = data_queue.get(timeout=1)
-                table.after(0, update_table, objects, frame_count)
+                rows = data_queue.get_nowait()
             except queue.Empty:
-                continue
-
-    def update_table(objects, frame_count):
-        pixel_to_mm = 0.1
-
-        existing_ids = {table.item(row)["values"][0] for row in table.get_children()}
-
-        for obj_id, data in objects.items():
-            x_pixel, y_pixel = data["coords"]
-            x_mm, y_mm = x_pixel * pixel_to_mm, y_pixel * pixel_to_mm
-
-            prev_x, prev_y = data.get("prev_coords", (x_pixel, y_pixel))
-            displacement = ((x_pixel - prev_x) ** 2 + (y_pixel - prev_y) ** 2) ** 0.5 * pixel_to_mm
-            data["prev_coords"] = (x_pixel, y_pixel)
-
-            average_velocity = data["total_velocity"] / data["velocity_count"] if data["velocity_count"] > 0 else 0
-            size_mm = data.get("size_mm", 0)
-            if average_velocity == 0:
-                continue
-
-            if obj_id in existing_ids:
-                for row in table.get_children():
-                    if table.item(row)["values"][0] == obj_id:
-                        table.item(row, values=(
-                            obj_id, frame_count,
-                            round(x_mm, 3), round(y_mm, 3),
-                            round(displacement, 3), round(average_velocity, 3),
-                            round(size_mm, 3)
-                        ))
-                        break
+                break
+            for values in rows:
+                pending[values[0]] = values
+        if pending:
+            update_table(pending.values())
+        app.after(UI_TICK_MS, poll_table_updates)
+
+    def update_table(rows):
+        for values in rows:
+            obj_id = values[0]
+            iid = table_rows.get(obj_id)
+            if iid is None:
+                table_rows[obj_id] = table.insert("", "end", values=values)
             else:
-                table.insert("", "end", values=(
-                    obj_id, frame_count,
-                    round(x_mm, 3), round(y_mm, 3),
-                    round(displacement, 3), round(average_velocity, 3),
-                    round(size_mm, 3)
-                ))
-            if obj_id not in tracked_data:
-                tracked_data[obj_id] = []
-            tracked_data[obj_id].append({
-                "frame": frame_count,
-                "x_mm": round(x_mm, 3),
-                "y_mm": round(y_mm, 3),
-                "displacement_mm": round(displacement, 3),
-                "average_velocity_mm_s": round(average_velocity, 3)
-            })
+                table.item(iid, values=values)
+            row_frames[obj_id] = values[1]
+
+        if len(table_rows) > MAX_TABLE_ROWS:  # Витісняємо об'єкти, які найдовше не оновлювались
+            stale = sorted(row_frames, key=row_frames.get)[:len(table_rows) - MAX_TABLE_ROWS]
+            table.delete(*(table_rows.pop(obj_id) for obj_id in stale))
+            for obj_id in stale:
+                del row_frames[obj_id]
+
+    def clear_table():
+        table.delete(*table.get_children())
+        table_rows.clear()
+        row_frames.clear()
 
     def select_video():
         filepath = filedialog.askopenfilename(filetypes=[("Video Files", "*.mp4;*.avi;*.mkv")])
         if filepath:
             file_entry.delete(0, END)
             file_entry.insert(0, filepath)
+            load_preview(filepath)
+
+    def load_preview(filepath):
+        """Відкриває відео для перегляду позиції; індекс кадрів береться з БД або будується у фоні."""
+        global preview_path, preview_cap, preview_index
+        from stream import is_stream_source
+
+        if filepath == preview_path:
+            return
+        if preview_cap is not None:
+            preview_cap.release()
+        preview_path, preview_cap, preview_index = filepath, None, None
+        position_scale.configure(to=0)
+        position_scale.set(0)
+        position_label.configure(text="")
+        if not filepath or is_stream_source(filepath):
+            return
+
+        def build():
+            global preview_cap, preview_index
+            from processor import load_index, open_video
+            cap = None
+            try:
+                cap, _ = open_video(filepath)
+                index = load_index(filepath, store=True)
+            except Exception as e:  # Пошкоджений файл, помилка OpenCV або розбору MP4, недоступна БД
+                if cap is not None:
+                    cap.release()
+                message = f"Перегляд позиції недоступний: не вдалося побудувати індекс кадрів.\n{e}"
+                app.after(0, lambda: show_warning_message("Увага", message))
+                return
+            if filepath != preview_path or not len(index):  # Поки будувався індекс, вибрано інше відео
+                cap.release()
+                return
+            preview_cap, preview_index = cap, index
+            app.after(0, lambda: (position_scale.configure(to=len(index) - 1), show_position(0)))
+
+        threading.Thread(target=build, daemon=True).start()
+
+    def on_scrub(value):
+        if is_playing or preview_index is None:
+            return
+        if scrub_job[0] is not None:
+            app.after_cancel(scrub_job[0])
+        scrub_job[0] = app.after(SCRUB_DELAY_MS, show_position, int(float(value)))
+
+    def show_position(frame_number):
+        """Показує кадр frame_number відео з поля вибору (перехід за індексом кадрів)."""
+        global preview_display
+        from frameindex import seek
+
+        scrub_job[0] = None
+        if is_playing or preview_index is None:
+            return
+        frame_number = min(max(0, frame_number), len(preview_index) - 1)
+        seek(preview_cap, frame_number, preview_index)
+        ret, frame = preview_cap.read()
+        if not ret:
+            return
+        if preview_display is None:
+            from display import FrameDisplay
+            preview_display = FrameDisplay(video_label, right_frame.winfo_width(), right_frame.winfo_height())
+        preview_display.show(frame)
+        position_label.configure(
+            text=f"Кадр {frame_number} / {len(preview_index) - 1}, {preview_index.pts[frame_number]:.2f} с")
+
+    def jump_to_object():
+        """Переводить повзунок позиції на перший кадр, де записано об'єкт (з результатів у БД)."""
+        filepath = file_entry.get().strip()
+        obj_id = object_entry.get().strip()
+        if obj_id.isdigit():
+            obj_id = f"ID_{obj_id}"
+        if not obj_id or preview_index is None or filepath != preview_path:
+            show_warning_message("Увага", "Виберіть відеофайл і вкажіть ID об'єкта (наприклад, ID_3).")
+            return
+        from storage import find_object
+
+        frames = find_object(filepath, obj_id)
+        if frames is None:
+            show_warning_message("Увага", f"Об'єкт {obj_id} не знайдено в збережених результатах цього відео.")
+            return
+        position_scale.set(frames[0])
+        show_position(frames[0])
 
     def start_video():
         global is_playing, stop_event, tracked_data
@@ -362,148 +440,115 @@ def create_gui():
             show_warning_message("Увага", "Відео вже запущено!")
             return
         clear_graph()
-        filepath = file_entry.get()
+        filepath = file_entry.get().strip()
         if not filepath:
-            show_warning_message("Помилка", "Будь ласка, виберіть відеофайл.")
+            show_warning_message("Помилка", "Будь ласка, виберіть відеофайл або вкажіть камеру / URL потоку.")
             return
 
-        for row in table.get_children():
-            table.delete(row)
+        clear_table()
+        load_preview(filepath)
+        start = int(position_scale.get()) if preview_index is not None else 0  # Обробка з позиції повзунка
+        export = export_var.get()
 
 
         tracked_data = {}
 
 
         def play_video():
-            global is_playing
-            cap = cv2.VideoCapture(filepath)
-            if not cap.isOpened():
-                show_error_message("Помилка", f"Не вдалося відкрити відео: {filepath}")
+            global is_playing, tracked_data
+            import cv2
+            from display import FrameDisplay
+            from metrics import StageTimer
+            from pipeline import FramePipeline
+            from export import AnnotationExporter
+            from processor import VideoProcessor, open_video, result_filename
+            from storage import ResultWriter, register_stream, register_video
+            from stream import FLUSH_INTERVAL as STREAM_FLUSH_INTERVAL, is_stream_source, open_stream
+
+            live = is_stream_source(filepath)  # Камера або мережевий потік замість файлу
+            try:
+                cap, fps = open_stream(filepath) if live else open_video(filepath)
+            except IOError as e:
+                show_error_message("Помилка", str(e))
                 is_playing = False
                 return
 
             stop_event.clear()
             is_playing = True
 
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            if fps <= 0:
-                fps = 30
-            frame_delay = 1 / fps
-
-            back_sub = cv2.createBackgroundSubtractorMOG2(
-                history=int(settings["history"]),
-                varThreshold=int(settings["varThreshold"]),
-                detectShadows=True
-            )
-            display_width = right_frame.winfo_width()
-            display_height = right_frame.winfo_height()
-
-            object_data = {}
-            object_id_counter = -1
-            max_disappear_time = 1.0
-            min_visible_time = 1.0
-
-            last_frame_time = time.time()
-            prev_img = None
-            frame_count = 0
-            while cap.isOpened() and not stop_event.is_set():
-                ret, frame = cap.read()
-                if not ret:
-                    show_info_message("Відео завершено", "Відтворення відео завершено.")
-                    break
+            writer = exporter = display = None
+            failed = False
+            try:
+                processor = VideoProcessor(settings, fps, video_roi(settings, filepath))
+                processor.timer = StageTimer(source_fps=fps)
+                if live:  # Рядки живого потоку вже скидаються в БД через ResultWriter
+                    processor.tracked_data = None
+                else:
+                    tracked_data = processor.tracked_data
+                if start and not live:
+                    processor.warm_up(cap, start, preview_index)
+                display = FrameDisplay(video_label, right_frame.winfo_width(), right_frame.winfo_height(),
+                                       DISPLAY_FPS)
+                if live:
+                    writer = ResultWriter(register_stream(filepath), replace=False,
+                                          flush_interval=STREAM_FLUSH_INTERVAL, fps=fps)
+                else:
+                    writer = ResultWriter(register_video(filepath, start=start), fps=fps)
+                if export and not live:  # Відео з рамками кодується в окремому процесі
+                    export_path = os.path.splitext(result_filename(filepath))[0] + "_annotated.mp4"
+                    exporter = AnnotationExporter(filepath, export_path, fps, start, processor.frame_stride,
+                                                  preview_index if start else None)
+
+                def on_result(frame_count, visible, rows):
+                    if rows:
+                        data_queue.put(rows)
+                        writer.add(rows)
+                    if exporter:
+                        exporter.add(frame_count, visible)
+
+                def render(frame, visible):
+                    for obj_id, (x, y, w, h) in visible:
+                        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                        cv2.putText(frame, f"{obj_id}", (x, y - 10),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+
+                    display.submit(frame, processor.timer.format_overlay())
+
+                pipeline = FramePipeline(cap, processor, render=render, on_result=on_result,
+                                         frame_delay=1 / fps, stop_event=stop_event, live=live)
+                display.start()
+                pipeline.run()
+            except Exception as e:  # Заблокована БД, недоступний шлях експорту тощо
+                failed = True
+                show_error_message("Помилка", f"Обробку перервано.\n{e}")
+            finally:
+                is_playing = False
+                cap.release()
+                if display:
+                    display.stop()
+                for resource in (writer, exporter):
+                    if resource is None:
+                        continue
+                    try:
+                        resource.close()
+                    except Exception as e:
+                        failed = True
+                        show_error_message("Помилка", str(e))
+            if failed:
+                return
+            if not stop_event.is_set():
+                if live:
+                    show_warning_message("Потік перервано", "Джерело перестало надсилати кадри.")
+                else:
+                    show_info_message("Відео завершено", "Відтворення відео завершено." + (
+                        f"\nВідео з рамками: {exporter.output}" if exporter else ""))
 
-                fg_mask = back_sub.apply(frame)
-                _, fg_mask = cv2.threshold(fg_mask, 50, 255, cv2.THRESH_BINARY)
-                fg_mask = cv2.medianBlur(fg_mask, 5)
-
-                contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                current_objects = {}
-
-                current_time = time.time()
-                start_time = time.time()
-
-                for contour in contours:
-                    if cv2.contourArea(contour) > 1000:
-                        x, y, w, h = cv2.boundingRect(contour)
-                        pixel_to_mm = 0.1
-                        size_mm = (w * h) * pixel_to_mm
-                        cx, cy = x + w // 2, y + h // 2
-
-                        matched_id = None
-                        for obj_id, data in object_data.items():
-                            prev_coords = data["coords"]
-                            if ((cx - prev_coords[0]) ** 2 + (cy - prev_coords[1]) ** 2) ** 0.5 < 50:
-                                matched_id = obj_id
-                                break
-
-                        if matched_id is None:
-                            object_id_counter += 1
-                            matched_id = f"ID_{object_id_counter}"
-                            object_data[matched_id] = {
-                                "coords": (cx, cy),
-                                "size_mm": size_mm,
-                                "velocity": 0,
-                                "total_velocity": 0,
-                                "velocity_count": 0,
-                                "start_time": current_time,
-                                "last_seen": current_time,
-                                "visible": False,
-                            }
-
-
-                        prev_coords = object_data[matched_id]["coords"]
-                        distance = ((cx - prev_coords[0]) ** 2 + (cy - prev_coords[1]) ** 2) ** 0.5
-                        velocity = distance * fps
-                        if velocity > 0:
-
-                            object_data[matched_id]["coords"] = (cx, cy)
-                            object_data[matched_id]["velocity"] = velocity
-                            object_data[matched_id]["last_seen"] = current_time
-
-                            object_data[matched_id]["total_velocity"] += velocity
-                            object_data[matched_id]["velocity_count"] += 1
-
-                        if not object_data[matched_id]["visible"] and \
-                                current_time - object_data[matched_id]["start_time"] >= min_visible_time:
-                            object_data[matched_id]["visible"] = True
-
-                        if object_data[matched_id]["visible"]:
-                            current_objects[matched_id] = object_data[matched_id]
-                            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                            cv2.putText(frame, f"{matched_id}", (x, y - 10),
-                                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-
-                if frame_count % 5 == 0:
-                    data_queue.put((object_data.copy(), frame_count, time.time() - start_time))
-
-                for obj_id, data in list(object_data.items()):
-                    if current_time - data["last_seen"] > max_disappear_time:
-                        del object_data[obj_id]
-
-                frame = cv2.resize(frame, (display_width, display_height))
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                img = ImageTk.PhotoImage(Image.fromarray(frame))
-                video_label.imgtk = img
-                video_label.configure(image=img)
-                prev_img = img
-
-                time_to_wait = frame_delay - (time.time() - last_frame_time)
-                if time_to_wait > 0:
-                    time.sleep(time_to_wait)
-                last_frame_time = time.time()
-
-                frame_count += 1
-
-            cap.release()
-            is_playing = False
-            save_data_to_json()
-            video_label.configure(image=prev_img or "")
+            if not live:
+                save_data_to_json()
 
         video_thread = threading.Thread(target=play_video, daemon=True)
         video_thread.start()
 
-    threading.Thread(target=update_table_worker, daemon=True).start()
-
     def stop_video():
         global is_playing, stop_event
 
@@ -568,6 +613,26 @@ def create_gui():
     stop_button = ttk.Button(controls_frame, text="Зупинити", bootstyle="danger", command=stop_video)
     stop_button.pack(side=LEFT, padx=5)
 
+    export_var = ttk.BooleanVar(value=False)
+    export_check = ttk.Checkbutton(controls_frame, text="Записати відео з рамками", variable=export_var)
+    export_check.pack(side=LEFT, padx=5)
+
+    position_frame = ttk.Frame(main_frame)
+    position_frame.pack(fill=X, pady=5)
+
+    scrub_job = [None]  # Відкладене оновлення кадру позиції (after id)
+    position_scale = ttk.Scale(position_frame, from_=0, to=0, orient=HORIZONTAL, command=on_scrub)
+    position_scale.pack(side=LEFT, fill=X, expand=True, padx=5)
+
+    position_label = ttk.Label(position_frame, width=32)
+    position_label.pack(side=LEFT, padx=5)
+
+    object_entry = ttk.Entry(position_frame, width=12)
+    object_entry.pack(side=LEFT, padx=5)
+
+    object_button = ttk.Button(position_frame, text="Перейти до об'єкта", command=jump_to_object)
+    object_button.pack(side=LEFT, padx=5)
+
 
     content_frame = ttk.Frame(main_frame)
     content_frame.pack(fill=BOTH, expand=True)
@@ -632,8 +697,10 @@ def create_gui():
     statistics_menu.add_command(label="Показати статистику", command=open_statistics)
     menubar.add_cascade(label="Статистика", menu=statistics_menu)
     menubar.add_cascade(label="Налаштування", menu=settings_menu)
+    app.after(UI_TICK_MS, poll_table_updates)
     app.mainloop()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Процес кодування відео у збірці cx_Freeze запускає цей самий exe
     gui_thread = threading.Thread(target=create_gui)
     gui_thread.start()
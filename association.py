@@ -0,0 +1,65 @@
+import warnings
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy необов'язковий - без нього лише жадібне зіставлення
+    linear_sum_assignment = None
+
+ASSOCIATION_METHODS = ("greedy", "hungarian")
+
+
+def resolve_method(method):
+    """Метод зіставлення, який буде використано насправді.
+
+    "hungarian" без scipy замінюється на "greedy" з попередженням (RuntimeWarning, один раз на процес),
+    щоб налаштування не ігнорувалось непомітно.
+    """
+    if method not in ASSOCIATION_METHODS:
+        raise ValueError(f"Невідомий метод зіставлення: {method}")
+    if method == "hungarian" and linear_sum_assignment is None:
+        warnings.warn("association='hungarian' потребує scipy (pip install scipy); "
+                      "використовується жадібне зіставлення", RuntimeWarning, stacklevel=2)
+        return "greedy"
+    return method
+
+
+def distance_matrix(detections, tracks):
+    """Евклідові відстані між центрами: рядки - виявлення, стовпці - відомі об'єкти."""
+    detections = np.asarray(detections, dtype=np.float64).reshape(-1, 2)
+    tracks = np.asarray(tracks, dtype=np.float64).reshape(-1, 2)
+    diff = detections[:, None, :] - tracks[None, :, :]
+    return np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+
+
+def associate(detections, tracks, gate, method="greedy"):
+    """Зіставляє центри виявлень з центрами об'єктів один до одного.
+
+    Пари далі за gate (px) не розглядаються. "greedy" бере пари від найближчої,
+    "hungarian" мінімізує сумарну відстань (потребує scipy, інакше - greedy).
+    Повертає словник {індекс виявлення: індекс об'єкта}.
+    """
+    if method not in ASSOCIATION_METHODS:
+        raise ValueError(f"Невідомий метод зіставлення: {method}")
+    if len(detections) == 0 or len(tracks) == 0:
+        return {}
+
+    distances = distance_matrix(detections, tracks)
+    within_gate = distances < gate
+
+    if method == "hungarian" and linear_sum_assignment is not None:
+        # Пари поза воротами отримують вартість, більшу за будь-яку допустиму
+        cost = np.where(within_gate, distances, gate * (distances.shape[0] + distances.shape[1] + 1))
+        rows, cols = linear_sum_assignment(cost)
+        return {int(r): int(c) for r, c in zip(rows, cols) if within_gate[r, c]}
+
+    rows, cols = np.nonzero(within_gate)
+    order = np.argsort(distances[rows, cols], kind="stable")
+    matches = {}
+    used_tracks = set()
+    for r, c in zip(rows[order].tolist(), cols[order].tolist()):
+        if r not in matches and c not in used_tracks:
+            matches[r] = c
+            used_tracks.add(c)
+    return matches
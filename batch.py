@@ -0,0 +1,123 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config import SETTINGS_FILE, load_settings
+from maskcache import CACHE_DIR, MaskCache
+from processor import process_video
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv")  # Ті ж формати, що й у select_video
+
+
+def find_videos(pattern):
+    """Повертає відсортований список відеофайлів у каталозі або за glob-шаблоном."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*")
+    return sorted(path for path in glob.glob(pattern)
+                  if os.path.isfile(path) and path.lower().endswith(VIDEO_EXTENSIONS))
+
+
+def result_names(videos):
+    """Назви файлів результатів для кожного відео, без збігів у спільному каталозі результатів.
+
+    Зазвичай це назва файлу без розширення; якщо вона повторюється (cam.mp4 у різних каталогах,
+    a.mp4 і a.avi) - шлях відносно спільного каталогу разом із розширенням: "day1_cam_mp4".
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in videos]
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in videos]) if videos else ""
+    names = []
+    for path, stem in zip(videos, stems):
+        if stems.count(stem) > 1:
+            relative = os.path.relpath(os.path.abspath(path), root)
+            stem = relative.replace(os.sep, "_").replace("/", "_").replace(".", "_")
+        names.append(stem)
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Однакові назви файлів результатів: {', '.join(sorted(duplicates))}")
+    return names
+
+
+def _process_one(filepath, settings, output_dir, store, output_format, cache, name=None):
+    """Обробка одного файлу в окремому процесі; помилки повертаються як результат."""
+    try:
+        return process_video(filepath, settings, output_dir, store, output_format, cache=cache, name=name)
+    except Exception as e:
+        return {"video": filepath, "error": str(e)}
+
+
+def process_batch(videos, settings, output_dir=".", workers=None, on_result=None, store=False,
+                  output_format="json", cache=None):
+    """Обробляє список відео пулом процесів; кожен процес має власний MOG2 і трекер.
+
+    on_result(stats, done, total) викликається в батьківському процесі після кожного файлу.
+    Назви файлів результатів не збігаються навіть для однакових імен відео (див. result_names).
+    Повертає статистику по файлах у порядку завершення.
+    """
+    results = []
+    names = result_names(videos)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_process_one, path, settings, output_dir, store, output_format, cache, name)
+                   for path, name in zip(videos, names)]
+        for future in as_completed(futures):
+            stats = future.result()
+            results.append(stats)
+            if on_result:
+                on_result(stats, len(results), len(videos))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Паралельна обробка набору відео")
+    parser.add_argument("source", help="Каталог або glob-шаблон (наприклад, 'data/*.mp4')")
+    parser.add_argument("-o", "--output-dir", default=".", help="Каталог для JSON-результатів")
+    parser.add_argument("-s", "--settings", default=SETTINGS_FILE, help="Файл налаштувань")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Кількість процесів (типово - кількість ядер)")
+    parser.add_argument("--db", action="store_true", help="Зберегти результати також у базу даних")
+    parser.add_argument("--format", choices=("json", "columnar"), default="json", help="Формат файлів результатів")
+    parser.add_argument("--cache", nargs="?", const=CACHE_DIR, default=None, metavar="DIR",
+                        help="Кеш масок переднього плану для повторних запусків")
+    args = parser.parse_args(argv)
+
+    videos = find_videos(args.source)
+    if not videos:
+        print(f"Відеофайли не знайдено: {args.source}")
+        return
+
+    if args.db:
+        from db import engine, ensure_schema
+        ensure_schema()  # Один раз у батьківському процесі, щоб процеси не створювали таблиці одночасно
+        engine.dispose()  # Дочірні процеси не повинні успадкувати відкриті з'єднання
+    os.makedirs(args.output_dir, exist_ok=True)
+    start_time = time.perf_counter()
+
+    def report_progress(stats, done, total):
+        elapsed = time.perf_counter() - start_time
+        eta = elapsed / done * (total - done)
+        if "error" in stats:
+            status = f"ПОМИЛКА: {stats['error']}"
+        else:
+            status = f"{stats['frames']} кадрів, {stats['fps']:.1f} кадр/с"
+        print(f"[{done}/{total}] {stats['video']}: {status} | минуло {elapsed:.0f} с, залишилось ~{eta:.0f} с")
+
+    results = process_batch(videos, load_settings(args.settings), args.output_dir, args.workers, report_progress,
+                            args.db, args.format, MaskCache(args.cache) if args.cache else None)
+    elapsed = time.perf_counter() - start_time
+
+    print("\nПродуктивність по файлах:")
+    total_frames = 0
+    for stats in sorted(results, key=lambda s: s["video"]):
+        if "error" in stats:
+            print(f"  {stats['video']}: ПОМИЛКА")
+            continue
+        total_frames += stats["frames"]
+        print(f"  {stats['video']}: {stats['frames']} кадрів за {stats['elapsed_s']:.2f} с "
+              f"({stats['fps']:.1f} кадр/с){' [кеш]' if stats['cached'] else ''} -> {stats['output']}")
+    failed = sum(1 for stats in results if "error" in stats)
+    print(f"Разом: {len(results) - failed} файлів, {total_frames} кадрів за {elapsed:.2f} с "
+          f"({total_frames / elapsed if elapsed > 0 else 0:.1f} кадр/с), помилок: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Спільне для бенчмарків: відомості про середовище для звітів."""
+import subprocess
+
+
+def git_commit():
+    """Короткий хеш поточного коміту або None (не git-репозиторій / git не встановлено)."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,100 @@
+"""Порівняння швидкості та точності виявлення при зменшенні роздільності та проріджуванні кадрів.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.decimation 176796-856056418_tiny.mp4 --scales 1 0.5 0.25 --strides 1 2
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from config import SETTINGS_FILE, load_settings, video_roi
+from processor import SAMPLE_EVERY, VideoProcessor, open_video
+
+
+def run_config(filepath, settings, scale, stride):
+    cap, fps = open_video(filepath)
+    processor = VideoProcessor(dict(settings, processing_scale=scale, frame_stride=stride), fps,
+                               video_roi(settings, filepath))
+    start_time = time.perf_counter()
+    try:
+        tracked_data = processor.run(cap)
+    finally:
+        cap.release()
+    return tracked_data.to_dict(), time.perf_counter() - start_time
+
+
+def _samples(tracked_data):
+    """Масив (frame, x_mm, y_mm, velocity) усіх рядків."""
+    rows = [(e["frame"], e["x_mm"], e["y_mm"], e["average_velocity_mm_s"])
+            for entries in tracked_data.values() for e in entries]
+    return np.array(rows, dtype=np.float64).reshape(-1, 4)
+
+
+def compare_to_reference(reference, candidate, tolerance_mm=5.0):
+    """Частка рядків еталону, для яких у кандидата є рядок поруч у часі та просторі, і похибка.
+
+    Рядок вважається знайденим, якщо у кандидата є рядок у межах SAMPLE_EVERY кадрів
+    і tolerance_mm за положенням.
+    """
+    ref, cand = _samples(reference), _samples(candidate)
+    if len(ref) == 0 or len(cand) == 0:
+        return {"recall": 0.0 if len(ref) else 1.0, "mean_error_mm": None, "velocity_ratio": None}
+
+    errors, velocity_ratios = [], []
+    for frame, x, y, velocity in ref:
+        near = cand[np.abs(cand[:, 0] - frame) < SAMPLE_EVERY]
+        if len(near) == 0:
+            continue
+        distances = np.hypot(near[:, 1] - x, near[:, 2] - y)
+        best = int(np.argmin(distances))
+        if distances[best] <= tolerance_mm:
+            errors.append(distances[best])
+            if velocity > 0:
+                velocity_ratios.append(near[best, 3] / velocity)
+    return {
+        "recall": len(errors) / len(ref),
+        "mean_error_mm": float(np.mean(errors)) if errors else None,
+        "velocity_ratio": float(np.median(velocity_ratios)) if velocity_ratios else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк режимів processing_scale / frame_stride")
+    parser.add_argument("video", help="Шлях до відеофайлу")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.5, 0.25])
+    parser.add_argument("--strides", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("-s", "--settings", default=SETTINGS_FILE, help="Файл налаштувань")
+    parser.add_argument("--json", help="Зберегти результати у JSON-файл")
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.settings)
+    reference, reference_time = run_config(args.video, settings, 1.0, 1)
+
+    results = []
+    print(f"{'scale':>6} {'stride':>6} {'час, с':>8} {'приск.':>7} {'об.':>4} {'recall':>7} {'похибка, мм':>12} "
+          f"{'v/v0':>6}")
+    for scale in args.scales:
+        for stride in args.strides:
+            if scale == 1.0 and stride == 1:
+                tracked_data, elapsed = reference, reference_time
+            else:
+                tracked_data, elapsed = run_config(args.video, settings, scale, stride)
+            accuracy = compare_to_reference(reference, tracked_data)
+            result = {"scale": scale, "stride": stride, "elapsed_s": elapsed,
+                      "speedup": reference_time / elapsed if elapsed > 0 else None,
+                      "objects": len(tracked_data), **accuracy}
+            results.append(result)
+            error = f"{accuracy['mean_error_mm']:.2f}" if accuracy["mean_error_mm"] is not None else "-"
+            ratio = f"{accuracy['velocity_ratio']:.2f}" if accuracy["velocity_ratio"] is not None else "-"
+            print(f"{scale:>6.2f} {stride:>6} {elapsed:>8.2f} {result['speedup']:>7.2f} {len(tracked_data):>4} "
+                  f"{accuracy['recall']:>7.2f} {error:>12} {ratio:>6}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"video": args.video, "results": results}, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
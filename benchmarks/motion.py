@@ -0,0 +1,85 @@
+"""Прискорення від пропуску кадрів без руху (motion_threshold) на записах з довгими статичними ділянками.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.motion                          # синтетичне відео, 80% кадрів без руху
+    python -m benchmarks.motion video.mp4 --thresholds 4 8 16
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.decimation import compare_to_reference
+from benchmarks.synthetic import generate_video
+from config import SETTINGS_FILE, load_settings, video_roi
+from processor import VideoProcessor, open_video
+
+
+def run_gated(filepath, settings, threshold):
+    """Один прогін з motion_threshold=threshold; повертає (tracked_data, час, кадрів без руху, всього кадрів)."""
+    cap, fps = open_video(filepath)
+    processor = VideoProcessor(dict(settings, motion_threshold=threshold), fps, video_roi(settings, filepath))
+    start_time = time.perf_counter()
+    try:
+        tracked_data = processor.run(cap)
+    finally:
+        cap.release()
+    elapsed = time.perf_counter() - start_time
+    return tracked_data.to_dict(), elapsed, processor.static_frames, processor.frame_count // processor.frame_stride
+
+
+def benchmark(filepath, settings, thresholds):
+    reference, reference_time, _, frames = run_gated(filepath, settings, 0)
+    results = [{"threshold": 0, "elapsed_s": reference_time, "speedup": 1.0, "static_share": 0.0,
+                "objects": len(reference), "recall": 1.0}]
+    for threshold in thresholds:
+        tracked_data, elapsed, static, _ = run_gated(filepath, settings, threshold)
+        accuracy = compare_to_reference(reference, tracked_data)
+        results.append({"threshold": threshold, "elapsed_s": elapsed,
+                        "speedup": reference_time / elapsed if elapsed > 0 else None,
+                        "static_share": static / frames if frames else 0.0,
+                        "objects": len(tracked_data), "recall": accuracy["recall"]})
+    return frames, results
+
+
+def print_results(name, frames, results):
+    print(f"{name}: {frames} кадрів")
+    print(f"{'поріг':>6} {'час, с':>8} {'приск.':>7} {'без руху':>9} {'об.':>4} {'recall':>7}")
+    for result in results:
+        print(f"{result['threshold']:>6g} {result['elapsed_s']:>8.2f} {result['speedup']:>7.2f} "
+              f"{result['static_share']:>9.0%} {result['objects']:>4} {result['recall']:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк пропуску кадрів без руху")
+    parser.add_argument("videos", nargs="*", help="Відеофайли (типово - синтетичне відео з простоєм)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[4, 8, 16], help="Значення motion_threshold")
+    parser.add_argument("--synthetic-frames", type=int, default=600)
+    parser.add_argument("--idle-share", type=float, default=0.8, help="Частка кадрів без руху в синтетичному відео")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-s", "--settings", default=SETTINGS_FILE, help="Файл налаштувань")
+    parser.add_argument("--json", help="Зберегти результати у JSON-файл")
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.settings)
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        videos = args.videos
+        if not videos:
+            idle_frames = int(args.synthetic_frames * args.idle_share)
+            videos = [generate_video(os.path.join(tmp_dir, f"synthetic_idle{idle_frames}.mp4"),
+                                     frames=args.synthetic_frames, seed=args.seed, idle_frames=idle_frames)]
+        for path in videos:
+            frames, results = benchmark(path, settings, args.thresholds)
+            name = os.path.basename(path)
+            report[name] = {"frames": frames, "results": results}
+            print_results(name, frames, results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Відтворюваний бенчмарк конвеєра виявлення/відстеження.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.pipeline -o bench.json
+    python -m benchmarks.pipeline --compare old.json new.json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from config import SETTINGS_FILE, load_settings, video_roi
+from metrics import StageTimer
+from processor import VideoProcessor, open_video, save_tracked_data
+from benchmarks.common import git_commit
+from benchmarks.synthetic import generate_video
+
+try:
+    import resource
+except ImportError:  # Windows - пікова пам'ять лише через tracemalloc
+    resource = None
+
+BUNDLED_VIDEOS = ["176796-856056418_tiny.mp4", "176796-856056418_tiny_Trim.mp4"]
+# "output" - вибірка рядків у VideoProcessor.sample(), "save" - запис JSON після обробки
+STAGES = ("decode", "preprocess", "gate", "mog2", "morphology", "contours", "association", "output", "save")
+
+
+def _peak_memory_mb():
+    """Пікова пам'ять процесу; без модуля resource - лише Python-алокації (tracemalloc)."""
+    if resource is None:
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: КіБ
+
+
+def run_case(filepath, settings):
+    """Один прогін у поточному процесі; повертає час по стадіях, кадри/с і пікову пам'ять."""
+    if resource is None:
+        tracemalloc.start()
+    cap, fps = open_video(filepath)
+    processor = VideoProcessor(settings, fps, video_roi(settings, filepath))
+    processor.timer = StageTimer()
+    start_time = time.perf_counter()
+    try:
+        tracked_data = processor.run(cap)
+    finally:
+        cap.release()
+    with processor.timer.measure("save"), tempfile.TemporaryDirectory() as tmp:
+        save_tracked_data(tracked_data, os.path.join(tmp, "result.json"))
+    elapsed = time.perf_counter() - start_time
+
+    frames = processor.frame_count // processor.frame_stride
+    return {
+        "frames": frames,
+        "objects": len(tracked_data),
+        "elapsed_s": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "stages": processor.timer.summary(),
+        "peak_memory_mb": _peak_memory_mb(),
+    }
+
+
+def _run_isolated(filepath, settings):
+    """Кожен випадок - у свіжому процесі, щоб пікова пам'ять не накопичувалась між прогонами."""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_case, filepath, settings).result()
+
+
+def collect_cases(args, tmp_dir):
+    """Список (назва, шлях) випадків: вбудовані відео та синтетичні."""
+    cases = [(os.path.basename(path), path) for path in BUNDLED_VIDEOS if os.path.exists(path)]
+    for resolution in args.synthetic_resolutions:
+        width, height = map(int, resolution.lower().split("x"))
+        for objects in args.synthetic_objects:
+            name = f"synthetic_{width}x{height}_{objects}obj"
+            path = os.path.join(tmp_dir, f"{name}.mp4")
+            generate_video(path, width, height, args.synthetic_frames, objects, seed=args.seed)
+            cases.append((name, path))
+    return cases
+
+
+def print_result(name, result):
+    stages = result["stages"]
+    total = sum(stage["total_s"] for stage in stages.values()) or 1.0
+    parts = ", ".join(f"{stage} {stages[stage]['mean_ms']:.2f} мс ({stages[stage]['total_s'] / total:.0%})"
+                      for stage in STAGES if stage in stages)
+    print(f"{name}: {result['frames']} кадрів, {result['fps']:.1f} кадр/с, "
+          f"пам'ять {result['peak_memory_mb']:.0f} МБ\n    {parts}")
+
+
+def compare(old_path, new_path):
+    """Друкує зміну кадрів/с і часу стадій між двома JSON-звітами."""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for name, result in new["cases"].items():
+        before = old["cases"].get(name)
+        if before is None:
+            print(f"{name}: немає в {old_path}")
+            continue
+        change = (result["fps"] / before["fps"] - 1) if before["fps"] else 0.0
+        print(f"{name}: {before['fps']:.1f} -> {result['fps']:.1f} кадр/с ({change:+.1%})")
+        for stage in STAGES:
+            if stage in result["stages"] and stage in before["stages"]:
+                print(f"    {stage}: {before['stages'][stage]['mean_ms']:.2f} -> "
+                      f"{result['stages'][stage]['mean_ms']:.2f} мс")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк конвеєра виявлення/відстеження")
+    parser.add_argument("-o", "--output", help="Зберегти результати у JSON-файл")
+    parser.add_argument("-s", "--settings", default=SETTINGS_FILE, help="Файл налаштувань")
+    parser.add_argument("--synthetic-resolutions", nargs="*", default=["1280x720", "1920x1080"])
+    parser.add_argument("--synthetic-objects", type=int, nargs="*", default=[5, 50])
+    parser.add_argument("--synthetic-frames", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Порівняти два JSON-звіти")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    settings = load_settings(args.settings)
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "settings": settings,
+        "cases": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, path in collect_cases(args, tmp_dir):
+            result = _run_isolated(path, settings)
+            report["cases"][name] = result
+            print_result(name, result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
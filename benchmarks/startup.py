@@ -0,0 +1,132 @@
+"""Час запуску: імпорт модулів і поява першого вікна, кожен вимір - у свіжому інтерпретаторі.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.startup -o startup.json
+    python -m benchmarks.startup --compare old.json new.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import git_commit
+
+MODULES = ["Var3", "processor", "storage", "db", "plotting", "cv2", "numpy", "matplotlib.pyplot", "sqlalchemy"]
+HEAVY_MODULES = ("cv2", "numpy", "matplotlib", "sqlalchemy", "PIL")  # Не мають завантажуватись до першого вікна
+
+_IMPORT_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# mainloop() підміняється: вікно малюється один раз, час фіксується, і вікно закривається
+_WINDOW_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import ttkbootstrap
+import Var3
+imported = time.perf_counter() - start
+
+def mainloop(self, n=0):
+    self.update()
+    print(json.dumps({{"import_s": imported, "seconds": time.perf_counter() - start,
+                      "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+    self.destroy()
+
+ttkbootstrap.Window.mainloop = mainloop
+Var3.create_gui()
+"""
+
+
+def _run_python(code):
+    """Виконує код у новому процесі з коренем проєкту в sys.path; повертає розібраний JSON-рядок виводу."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "помилка")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(code, repeat):
+    """Медіана та мінімум за repeat запусків; None і текст помилки, якщо код не виконується."""
+    try:
+        runs = [_run_python(code) for _ in range(repeat)]
+    except RuntimeError as e:
+        return {"error": str(e)}
+    seconds = [run["seconds"] for run in runs]
+    return {"median_s": statistics.median(seconds), "min_s": min(seconds), "loaded": runs[-1]["loaded"]}
+
+
+def interpreter_startup(repeat):
+    """Час запуску порожнього інтерпретатора - базовий рівень для першого вікна."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def print_result(name, result):
+    if "error" in result:
+        print(f"{name:>26}: недоступно ({result['error']})")
+        return
+    loaded = ", ".join(result["loaded"]) or "-"
+    print(f"{name:>26}: {result['median_s'] * 1000:8.1f} мс (мін. {result['min_s'] * 1000:.1f}) | завантажено: {loaded}")
+
+
+def compare(old_path, new_path):
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if not before or "median_s" not in before or "median_s" not in result:
+            continue
+        print(f"{name:>26}: {before['median_s'] * 1000:.1f} -> {result['median_s'] * 1000:.1f} мс")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк часу запуску застосунку")
+    parser.add_argument("-o", "--output", help="Зберегти результати у JSON-файл")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Кількість запусків на вимір")
+    parser.add_argument("--modules", nargs="*", default=MODULES, help="Модулі для вимірювання імпорту")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Порівняти два JSON-звіти")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "interpreter_s": interpreter_startup(args.repeat),
+        "results": {},
+    }
+    print(f"{'python -c pass':>26}: {report['interpreter_s'] * 1000:8.1f} мс")
+    for module in args.modules:
+        result = measure(_IMPORT_CODE.format(module=module, heavy=HEAVY_MODULES), args.repeat)
+        report["results"][f"import {module}"] = result
+        print_result(f"import {module}", result)
+    result = measure(_WINDOW_CODE.format(heavy=HEAVY_MODULES), args.repeat)
+    report["results"]["first window"] = result
+    print_result("перше вікно", result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import cv2
+import numpy as np
+
+
+def generate_video(path, width=1280, height=720, frames=300, objects=5, fps=30, seed=0, idle_frames=0):
+    """Записує синтетичне відео: шумний статичний фон і objects рухомих прямокутників.
+
+    Об'єкти рухаються з постійною швидкістю та відбиваються від країв кадру.
+    idle_frames - кількість кадрів на початку, коли об'єктів немає (лише фон).
+    Повертає шлях до файлу.
+    """
+    rng = np.random.default_rng(seed)
+    background = rng.integers(40, 80, size=(height, width, 3), dtype=np.uint8)
+    background = cv2.GaussianBlur(background, (0, 0), 3)
+
+    sizes = rng.integers(30, 70, size=(objects, 2))
+    positions = rng.uniform((0, 0), (width - 70, height - 70), size=(objects, 2))
+    velocities = rng.uniform(-6, 6, size=(objects, 2))
+    colors = rng.integers(150, 255, size=(objects, 3)).tolist()
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    if not writer.isOpened():
+        raise IOError(f"Не вдалося створити відео: {path}")
+    try:
+        for frame_number in range(frames):
+            frame = background.copy()
+            noise = rng.integers(-4, 5, size=(height, width, 1), dtype=np.int16)
+            frame = np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+            if frame_number >= idle_frames:
+                positions += velocities
+                for axis, limit in ((0, width), (1, height)):
+                    out = (positions[:, axis] < 0) | (positions[:, axis] + sizes[:, axis] > limit)
+                    velocities[out, axis] *= -1
+                    positions[:, axis] = np.clip(positions[:, axis], 0, limit - sizes[:, axis])
+                for (x, y), (w, h), color in zip(positions.astype(int), sizes, colors):
+                    cv2.rectangle(frame, (int(x), int(y)), (int(x + w), int(y + h)), color, -1)
+            writer.write(frame)
+    finally:
+        writer.release()
+    return path
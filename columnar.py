@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from tracks import TrackStore
+
+COLUMNAR_SUFFIX = ".tracks"
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+
+# Стовпці: ім'я файлу -> (ключ у tracked_data, тип)
+COLUMNS = {
+    "frame": ("frame", np.int32),
+    "x_mm": ("x_mm", np.float32),
+    "y_mm": ("y_mm", np.float32),
+    "displacement_mm": ("displacement_mm", np.float32),
+    "velocity_mm_s": ("average_velocity_mm_s", np.float32),
+}
+
+
+def save_columnar(tracked_data, path):
+    """Зберігає tracked_data у каталог зі стовпцями .npy та індексом index.json.
+
+    Рядки впорядковані за об'єктом, тож рядки одного об'єкта - суцільний діапазон,
+    який читається з memory-mapped файлів без завантаження решти даних.
+    """
+    os.makedirs(path, exist_ok=True)
+    if isinstance(tracked_data, TrackStore):
+        _save_store(tracked_data, path)
+        return
+
+    objects = {}
+    offset = 0
+    for obj_id, entries in tracked_data.items():
+        objects[obj_id] = [offset, offset + len(entries)]
+        offset += len(entries)
+
+    for name, (key, dtype) in COLUMNS.items():
+        column = np.fromiter((entry[key] for entries in tracked_data.values() for entry in entries),
+                             dtype=dtype, count=offset)
+        np.save(os.path.join(path, f"{name}.npy"), column)
+    object_index = np.repeat(np.arange(len(objects), dtype=np.int32),
+                             [stop - start for start, stop in objects.values()])
+    np.save(os.path.join(path, "object.npy"), object_index)
+
+    _save_index(path, offset, objects)
+
+
+def _save_store(store, path):
+    """Запис прямо з масивів TrackStore, без проміжних словників."""
+    frame, object_index, values, objects = store.columns()
+    np.save(os.path.join(path, "frame.npy"), frame.astype(np.int32))
+    np.save(os.path.join(path, "object.npy"), object_index.astype(np.int32))
+    for i, name in enumerate(list(COLUMNS)[1:]):
+        np.save(os.path.join(path, f"{name}.npy"), values[:, i].astype(COLUMNS[name][1]))
+    _save_index(path, len(frame), objects)
+
+
+def _save_index(path, rows, objects):
+    with open(os.path.join(path, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump({"version": FORMAT_VERSION, "rows": rows, "objects": objects}, f, ensure_ascii=False)
+
+
+class TrackReader:
+    """Читання стовпчикового формату без розбору всього файлу."""
+
+    def __init__(self, path):
+        if os.path.basename(path) == INDEX_FILE:
+            path = os.path.dirname(path)
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Непідтримувана версія формату: {index.get('version')}")
+        self.objects = {obj_id: tuple(bounds) for obj_id, bounds in index["objects"].items()}
+        self.object_ids = list(self.objects)
+        self._columns = {}
+
+    def column(self, name):
+        """Стовпець як memory-mapped масив (читається з диска лише за потреби)."""
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+        return self._columns[name]
+
+    def object(self, obj_id):
+        """Усі рядки одного об'єкта: словник стовпець -> масив."""
+        start, stop = self.objects[obj_id]
+        return {name: np.array(self.column(name)[start:stop]) for name in COLUMNS}
+
+    def frames(self, first, last):
+        """Рядки всіх об'єктів для кадрів first..last включно; містить стовпець object_id."""
+        frame = self.column("frame")
+        rows = np.flatnonzero((frame >= first) & (frame <= last))
+        result = {name: np.asarray(self.column(name)[rows]) for name in COLUMNS}
+        ids = np.array(self.object_ids, dtype=object)
+        result["object_id"] = ids[np.asarray(self.column("object")[rows])] if len(ids) else ids
+        return result
+
+    def to_tracked_data(self, obj_ids=None):
+        """Перетворює дані (або лише обрані об'єкти) на звичну структуру tracked_data."""
+        tracked_data = {}
+        for obj_id in self.object_ids if obj_ids is None else obj_ids:
+            columns = self.object(obj_id)
+            tracked_data[obj_id] = [
+                {key: int(value) if key == "frame" else round(float(value), 3)
+                 for key, value in zip((COLUMNS[name][0] for name in COLUMNS), values)}
+                for values in zip(*(columns[name] for name in COLUMNS))
+            ]
+        return tracked_data
+
+
+def load_tracked_data(path):
+    """Завантажує результати з JSON або стовпчикового каталогу."""
+    if os.path.isdir(path) or os.path.basename(path) == INDEX_FILE:
+        return TrackReader(path).to_tracked_data()
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def convert_json(json_path, output_path=None):
+    """Конвертує існуючий JSON-файл результатів у стовпчиковий формат; повертає шлях."""
+    if output_path is None:
+        output_path = os.path.splitext(json_path)[0] + COLUMNAR_SUFFIX
+    with open(json_path, "r", encoding="utf-8") as f:
+        save_columnar(json.load(f), output_path)
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Конвертація JSON-результатів у стовпчиковий формат")
+    parser.add_argument("files", nargs="+", help="JSON-файли результатів")
+    args = parser.parse_args(argv)
+
+    for json_path in args.files:
+        print(f"{json_path} -> {convert_json(json_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import json
+import os
+
+SETTINGS_FILE = "settings.json"
+default_settings = {
+    "history": 500,
+    "varThreshold": 25,
+    "min_contour_area": 1000,
+    "max_disappear_time": 1.0,
+    "min_visible_time": 1.0,
+    "match_distance": 50,  # Ворота зіставлення: макс. відстань (px) між центрами
+    "association": "greedy",  # "greedy" або "hungarian" (потребує scipy)
+    "processing_scale": 1.0,  # Масштаб кадру для виявлення (< 1 - зменшене сіре зображення)
+    "frame_stride": 1,  # Аналізувати кожен n-й кадр
+    "motion_threshold": 0,  # > 0 - пропускати виявлення на кадрах без руху (поріг зміни яскравості, 0-255)
+    # ROI по відео: {"<ім'я файлу>": {"include": [[[x, y], ...], ...], "exclude": [...]}}
+    "roi": {}
+}
+
+
+def load_settings(path=SETTINGS_FILE):
+    """Зчитує налаштування з файлу; відсутні ключі беруться зі стандартних значень."""
+    settings = default_settings.copy()
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            settings.update(json.load(f))
+    return settings
+
+
+def video_roi(settings, filepath):
+    """ROI для відео з налаштувань (за іменем файлу) або None."""
+    return (settings.get("roi") or {}).get(os.path.basename(filepath))
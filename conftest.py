@@ -0,0 +1 @@
+# Корінь проєкту в sys.path для тестів (модулі лежать на верхньому рівні)
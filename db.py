@@ -1,13 +1,108 @@
+import os
+import threading
+from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, make_url, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import StaticPool
 
-DATABASE_URL = "sqlite:///database.db"  # Файл бази даних SQLite
-engine = create_engine(DATABASE_URL, echo=True)  # echo=True для логів SQL-запитів
+DATABASE_URL = os.environ.get("VIDEOSCRAP_DB_URL", "sqlite:///database.db")  # Файл бази даних SQLite
+DB_ECHO = os.environ.get("VIDEOSCRAP_DB_ECHO", "0") == "1"  # VIDEOSCRAP_DB_ECHO=1 для логів SQL-запитів
+SCHEMA_VERSION = 3  # Збільшувати при кожній зміні моделей (таблиці, стовпці, індекси)
+SCHEMA_TABLE = "schema_info"
+
+# PRAGMA для SQLite: WAL дозволяє читати під час запису, а busy_timeout змушує
+# паралельних записувачів чекати на блокування замість помилки "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 30000,  # мс
+    "cache_size": -64000,  # Від'ємне значення - у КіБ (64 МБ)
+    "mmap_size": 268435456,  # 256 МБ
+    "temp_store": "MEMORY",
+}
+
+
+def _is_memory_sqlite(url):
+    """sqlite://, sqlite:///:memory: та file:...?mode=memory - бази в пам'яті."""
+    parsed = make_url(url)
+    return parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory"
+
+
+def make_engine(url=DATABASE_URL, echo=DB_ECHO, pool_size=5, max_overflow=10):
+    """Створює engine; для SQLite вмикає PRAGMA та пул з'єднань, придатний для кількох потоків."""
+    if not url.startswith("sqlite"):
+        return create_engine(url, echo=echo, pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=True)
+
+    connect_args = {"check_same_thread": False, "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000}
+    if _is_memory_sqlite(url):
+        # База в пам'яті існує лише в межах з'єднання - усі потоки ділять одне (StaticPool)
+        new_engine = create_engine(url, echo=echo, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        new_engine = create_engine(url, echo=echo, connect_args=connect_args,
+                                   pool_size=pool_size, max_overflow=max_overflow)
+
+    @event.listens_for(new_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return new_engine
+
+
+engine = make_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+@contextmanager
+def session_scope():
+    """Сесія на одну задачу: commit при успіху, rollback при помилці, закриття завжди."""
+    session = SessionLocal()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
 def init_db():
+    """Створює відсутні таблиці та індекси й записує поточну версію схеми."""
     from models import Base  # Імпорт моделей тут, щоб уникнути циклічних імпортів
     Base.metadata.create_all(bind=engine)
+    # create_all не додає індекси до вже існуючих таблиць - створюємо відсутні окремо
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} (version INTEGER NOT NULL)"))
+        conn.execute(text(f"DELETE FROM {SCHEMA_TABLE}"))
+        conn.execute(text(f"INSERT INTO {SCHEMA_TABLE} (version) VALUES (:version)"), {"version": SCHEMA_VERSION})
+
+
+def schema_version():
+    """Версія схеми, записана в базі (0 - база ще не ініціалізована)."""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(SCHEMA_TABLE):
+            return 0
+        return conn.execute(text(f"SELECT MAX(version) FROM {SCHEMA_TABLE}")).scalar() or 0
+
+
+_schema_lock = threading.Lock()
+_schema_checked = False
+
+
+def ensure_schema():
+    """init_db() лише якщо схема в базі старіша за SCHEMA_VERSION; далі в процесі - без запитів до бази."""
+    global _schema_checked
+    with _schema_lock:
+        if not _schema_checked:
+            if schema_version() < SCHEMA_VERSION:
+                init_db()
+            _schema_checked = True
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class FrameDisplay:
+    """Показ кадрів у Tk-мітці без створення нового PhotoImage на кожен кадр.
+
+    Потік відображення готує кадр у заздалегідь виділений буфер (подвійна буферизація),
+    а головний потік Tk через after() не частіше за max_fps копіює найсвіжіший буфер
+    в один і той самий PhotoImage. Кадри, які не встигли показати, просто перезаписуються.
+    """
+
+    def __init__(self, label, width, height, max_fps=25):
+        self.label = label
+        self.size = (max(1, width), max(1, height))
+        self.interval_ms = max(1, int(1000 / max_fps))
+        self._buffers = [np.zeros((self.size[1], self.size[0], 3), dtype=np.uint8) for _ in range(2)]
+        self._front = 0
+        self._fresh = False
+        self._lock = threading.Lock()
+        self._photo = None
+        self._running = False
+        self._next_due = None  # Коли готувати наступний кадр (time.perf_counter)
+
+    def submit(self, frame, text=None, force=False):
+        """Готує кадр BGR до показу; викликається з потоку відображення.
+
+        Кадри готуються за розкладом не частіше за max_fps, а зайві відкидаються ще до зміни
+        розміру та перетворення кольорів, тож вартість показу не залежить від швидкості обробки.
+        """
+        now = time.perf_counter()
+        if not force and self._next_due is not None and now < self._next_due:
+            return
+        interval = self.interval_ms / 1000
+        self._next_due = now + interval if self._next_due is None else self._next_due + interval
+        if self._next_due <= now:  # Кадри надходили рідше за max_fps - розклад від поточного моменту
+            self._next_due = now + interval
+        back = self._buffers[1 - self._front]
+        cv2.resize(frame, self.size, dst=back)
+        if text:
+            cv2.putText(back, text, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        cv2.cvtColor(back, cv2.COLOR_BGR2RGB, dst=back)
+        with self._lock:
+            self._front = 1 - self._front
+            self._fresh = True
+
+    def show(self, frame, text=None):
+        """Одразу показує один кадр поза відтворенням (перегляд позиції); викликається з потоку Tk."""
+        self.submit(frame, text, force=True)
+        self._paint_latest()
+        self.label.configure(image=self._photo)  # Мітку міг перехопити інший FrameDisplay
+
+    def _paint_latest(self):
+        with self._lock:
+            if not self._fresh:
+                return
+            image = Image.fromarray(self._buffers[self._front])
+            if self._photo is None:
+                self._photo = ImageTk.PhotoImage(image)
+                self.label.imgtk = self._photo
+                self.label.configure(image=self._photo)
+            else:
+                self._photo.paste(image)
+            self._fresh = False
+
+    def _tick(self):
+        if not self._running:
+            return
+        self._paint_latest()
+        self.label.after(self.interval_ms, self._tick)
+
+    def start(self):
+        self._running = True
+        self.label.after(0, self._tick)
+
+    def stop(self):
+        """Зупиняє оновлення; останній підготовлений кадр лишається на екрані."""
+        self._running = False
+        self.label.after(0, self._paint_latest)
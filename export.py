@@ -0,0 +1,213 @@
+"""Відео з анотаціями (рамки та ID_n), яке кодується в окремому процесі.
+
+Під час аналізу кожен кадр дає лише компактний список рамок. Процес кодування сам заново
+декодує відео, малює рамки і записує MP4 через cv2.VideoWriter, тож аналіз на кодування не чекає.
+
+    python processor.py video.mp4 --export annotated.mp4               # разом з аналізом
+    python export.py video.mp4 result.boxes -o annotated.mp4            # пізніше, зі збережених рамок
+    python export.py video.mp4 result.json -o annotated.mp4             # з результатів (лише центри об'єктів)
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+from frameindex import seek
+
+BOXES_SUFFIX = ".boxes"
+QUEUE_SIZE = 32  # Декодованих кадрів у черзі процесу кодування
+FOURCC = "mp4v"
+COLOR = (0, 255, 0)
+_END = None
+
+
+def pack_boxes(visible):
+    """Рамки кадру [(obj_id, (x, y, w, h)), ...] -> масив int32 (N, 5): номер ID_n, x, y, w, h."""
+    rows = np.empty((len(visible), 5), dtype=np.int32)
+    for i, (obj_id, (x, y, w, h)) in enumerate(visible):
+        rows[i] = (int(obj_id.rsplit("_", 1)[1]), x, y, w, h)
+    return rows
+
+
+def draw_boxes(frame, rows):
+    """Малює рамки з підписами ID_n; рядок з w = h = 0 - лише центр об'єкта (x, y)."""
+    for number, x, y, w, h in rows.tolist():
+        if w or h:
+            cv2.rectangle(frame, (x, y), (x + w, y + h), COLOR, 2)
+            cv2.putText(frame, f"ID_{number}", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, COLOR, 2)
+        else:
+            cv2.circle(frame, (x, y), 6, COLOR, -1)
+            cv2.putText(frame, f"ID_{number}", (x + 8, y - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.5, COLOR, 2)
+    return frame
+
+
+def save_boxes(path, annotations, hold=1):
+    """Зберігає рамки [(кадр, рядки (N, 5)), ...]; hold - скільки кадрів показується кожен запис."""
+    frames = np.array([frame_number for frame_number, _ in annotations], dtype=np.int32)
+    counts = np.array([len(rows) for _, rows in annotations], dtype=np.int32)
+    rows = np.concatenate([rows for _, rows in annotations]) if annotations else np.empty((0, 5), np.int32)
+    with open(path, "wb") as f:  # Файловий об'єкт - щоб numpy не додавав розширення .npz
+        np.savez_compressed(f, frames=frames, counts=counts, rows=rows, hold=np.array(hold))
+
+
+def load_boxes(path):
+    """Зчитує файл .boxes; повертає ([(кадр, рядки), ...], hold)."""
+    with np.load(path) as data:
+        rows = np.split(data["rows"], np.cumsum(data["counts"])[:-1]) if len(data["counts"]) else []
+        return list(zip(data["frames"].tolist(), rows)), int(data["hold"])
+
+
+def results_annotations(tracked_data, pixel_to_mm):
+    """Анотації з результатів (JSON / .tracks): центри об'єктів на кадрах вибірки, без розмірів рамок."""
+    by_frame = {}
+    for obj_id, entries in tracked_data.items():
+        number = int(obj_id.rsplit("_", 1)[1])
+        for entry in entries:
+            by_frame.setdefault(entry["frame"], []).append(
+                (number, round(entry["x_mm"] / pixel_to_mm), round(entry["y_mm"] / pixel_to_mm), 0, 0))
+    return [(frame_number, np.array(by_frame[frame_number], dtype=np.int32).reshape(-1, 5))
+            for frame_number in sorted(by_frame)]
+
+
+def encode(filepath, output, annotations, start=0, hold=1, index=None, fps=None, queue_size=QUEUE_SIZE):
+    """Перекодовує відео з рамками; повертає кількість записаних кадрів.
+
+    annotations - ітератор (кадр, рядки (N, 5)) у порядку кадрів; кожен запис показується на
+    hold кадрах (при frame_stride > 1 - і на пропущених). Запис триває від start до останнього
+    анотованого кадру. Декодування йде на окремому потоці через обмежену чергу queue_size.
+    """
+    cap = cv2.VideoCapture(filepath)
+    if not cap.isOpened():
+        raise IOError(f"Не вдалося відкрити відео: {filepath}")
+    fps = fps or cap.get(cv2.CAP_PROP_FPS) or 30
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    writer = cv2.VideoWriter(output, cv2.VideoWriter_fourcc(*FOURCC), fps, size)
+    if not writer.isOpened():
+        cap.release()
+        raise IOError(f"Не вдалося створити відео: {output}")
+
+    frames = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+    errors = []  # Виняток потоку декодування - піднімається знову в основному потоці
+
+    def put(item):
+        while not stop_event.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def decode():
+        try:
+            seek(cap, start, index)
+            frame_number = start
+            while not stop_event.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    return
+                put((frame_number, frame))
+                frame_number += 1
+        except Exception as e:
+            errors.append(e)
+        finally:
+            put(_END)  # Інакше основний потік чекав би на frames.get() вічно
+
+    thread = threading.Thread(target=decode, daemon=True)
+    thread.start()
+    annotations = iter(annotations)
+    latest = (None, None)  # Останній запис з кадром <= поточного
+    upcoming = next(annotations, _END)
+    written = 0
+    try:
+        while True:
+            item = frames.get()
+            if item is _END:
+                if errors:
+                    raise errors[0]
+                break
+            frame_number, frame = item
+            while upcoming is not _END and upcoming[0] <= frame_number:
+                latest, upcoming = upcoming, next(annotations, _END)
+            if upcoming is _END and (latest[0] is None or frame_number >= latest[0] + hold):
+                break
+            if latest[0] is not None and frame_number < latest[0] + hold:
+                draw_boxes(frame, latest[1])
+            writer.write(frame)
+            written += 1
+    finally:
+        stop_event.set()
+        thread.join()
+        cap.release()
+        writer.release()
+    return written
+
+
+def _encode_process(filepath, output, messages, start, hold, index, fps, queue_size):
+    annotations = iter(messages.get, _END)
+    try:
+        encode(filepath, output, annotations, start, hold, index, fps, queue_size)
+    finally:
+        for _ in annotations:  # Дочитуємо чергу, щоб процес аналізу не завис на повному каналі
+            pass
+
+
+class AnnotationExporter:
+    """Запис відео з анотаціями паралельно з аналізом.
+
+    add() лише кладе компактний масив рамок у необмежену міжпроцесну чергу (put не блокується),
+    а декодування, малювання та кодування відбуваються в окремому процесі. Якщо кодування
+    повільніше за аналіз, чекає саме процес кодування; його черга декодованих кадрів обмежена.
+    """
+
+    def __init__(self, filepath, output, fps=None, start=0, hold=1, index=None, queue_size=QUEUE_SIZE):
+        self.output = output
+        context = multiprocessing.get_context("spawn")  # Без fork процесу з потоками OpenCV
+        self._messages = context.Queue()
+        self._process = context.Process(
+            target=_encode_process, daemon=True,
+            args=(filepath, output, self._messages, start, hold, index, fps, queue_size))
+        self._process.start()
+
+    def add(self, frame_number, visible):
+        """Рамки аналізованого кадру frame_number (порожній список теж - кадр без об'єктів)."""
+        self._messages.put((frame_number, pack_boxes(visible)))
+
+    def close(self):
+        """Завершує запис і чекає на процес кодування; піднімає RuntimeError, якщо кодування не вдалося."""
+        self._messages.put(_END)
+        self._process.join()
+        if self._process.exitcode != 0:
+            self._messages.cancel_join_thread()  # Непрочитані повідомлення не повинні блокувати вихід
+            raise RuntimeError(f"Кодування {self.output} завершилось з помилкою (код {self._process.exitcode})")
+
+
+def main(argv=None):
+    from columnar import load_tracked_data
+    from processor import PIXEL_TO_MM, SAMPLE_EVERY
+
+    parser = argparse.ArgumentParser(description="Відео з рамками зі збережених результатів, без повторного аналізу")
+    parser.add_argument("video", help="Шлях до відеофайлу")
+    parser.add_argument("annotations", help="Файл рамок .boxes або результати (JSON / .tracks)")
+    parser.add_argument("-o", "--output", default=None, help="Файл MP4 (типово - <назва>_annotated.mp4)")
+    args = parser.parse_args(argv)
+
+    if args.annotations.endswith(BOXES_SUFFIX):
+        annotations, hold = load_boxes(args.annotations)
+        start = annotations[0][0] if annotations else 0  # Рамки записуються з першого аналізованого кадру
+    else:  # У результатах немає розмірів рамок - позначаються центри об'єктів на кадрах вибірки
+        annotations, hold = results_annotations(load_tracked_data(args.annotations), PIXEL_TO_MM), SAMPLE_EVERY
+        start = 0
+    if not annotations:
+        raise SystemExit(f"{args.annotations}: немає анотацій")
+    output = args.output or f"{os.path.splitext(os.path.basename(args.video))[0]}_annotated.mp4"
+    written = encode(args.video, output, annotations, start, hold)
+    print(f"{args.video}: {written} кадрів з анотаціями -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+import argparse
+import io
+import struct
+
+import cv2
+import numpy as np
+
+INDEX_VERSION = 1
+_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"edts"}
+
+
+class FrameIndex:
+    """Індекс кадрів відео: час показу (pts, с) кожного кадру, ключові кадри та їхні зміщення у файлі.
+
+    Кадри нумеруються в порядку показу - так само, як їх повертає cv2.VideoCapture.
+    source: "mp4" - зчитано з таблиць контейнера (stts/ctts/stss/stco), "scan" - повним проходом
+    через OpenCV (ключові кадри тоді невідомі).
+    """
+
+    def __init__(self, pts, keyframes, offsets=None, source="mp4"):
+        self.pts = np.asarray(pts, dtype=np.float64)
+        self.keyframes = np.asarray(keyframes, dtype=np.int64)
+        self.offsets = None if offsets is None else np.asarray(offsets, dtype=np.int64)
+        self.source = source
+
+    def __len__(self):
+        return len(self.pts)
+
+    @property
+    def fps(self):
+        if len(self.pts) < 2 or self.pts[-1] <= self.pts[0]:
+            return 0.0
+        return (len(self.pts) - 1) / (self.pts[-1] - self.pts[0])
+
+    def frame_at(self, seconds):
+        """Номер кадру, який показується в момент seconds."""
+        return max(0, int(np.searchsorted(self.pts, seconds, "right")) - 1)
+
+    def keyframe_before(self, frame_number):
+        """Найближчий ключовий кадр не пізніше frame_number або None, якщо ключові кадри невідомі."""
+        position = int(np.searchsorted(self.keyframes, frame_number, "right")) - 1
+        return int(self.keyframes[position]) if position >= 0 else None
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        arrays = {"pts": self.pts, "keyframes": self.keyframes, "version": np.array(INDEX_VERSION)}
+        if self.offsets is not None:
+            arrays["offsets"] = self.offsets
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data, source="mp4"):
+        with np.load(io.BytesIO(data)) as arrays:
+            if int(arrays["version"]) != INDEX_VERSION:
+                raise ValueError(f"Непідтримувана версія індексу: {int(arrays['version'])}")
+            offsets = arrays["offsets"] if "offsets" in arrays.files else None
+            return cls(arrays["pts"], arrays["keyframes"], offsets, source)
+
+
+def _boxes(f, start, end):
+    """(тип, початок даних, кінець) для кожного бокса MP4 у діапазоні [start, end)."""
+    position = start
+    while position + 8 <= end:
+        f.seek(position)
+        size, kind = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - position
+        if size < header:
+            break
+        yield kind, position + header, position + size
+        position += size
+
+
+def _find_boxes(f, start, end, found):
+    """Рекурсивно збирає вміст листових боксів першої відеодоріжки в found {тип: bytes}."""
+    for kind, data_start, data_end in _boxes(f, start, end):
+        if kind == b"trak":
+            track = {}
+            _find_boxes(f, data_start, data_end, track)
+            if track.get(b"hdlr", b"")[8:12] == b"vide" and b"stsz" in track:
+                found.update(track)
+                return True
+        elif kind in _CONTAINERS:
+            if _find_boxes(f, data_start, data_end, found):
+                return True
+        elif kind in (b"mdhd", b"hdlr", b"stts", b"ctts", b"stss", b"stsz", b"stsc", b"stco", b"co64", b"elst"):
+            f.seek(data_start)
+            found[kind] = f.read(data_end - data_start)
+    return False
+
+
+def _table(box, columns, dtype=">u4", header=8):
+    """Таблиця з entry_count рядків після заголовка full box (версія/прапорці + кількість)."""
+    count = struct.unpack(">I", box[4:8])[0]
+    return np.frombuffer(box, dtype=dtype, count=count * columns, offset=header).reshape(count, columns)
+
+
+def read_mp4_index(filepath):
+    """Будує FrameIndex з таблиць MP4/MOV без декодування; None, якщо файл не MP4 або без відеодоріжки."""
+    boxes = {}
+    with open(filepath, "rb") as f:
+        f.seek(0, 2)
+        _find_boxes(f, 0, f.tell(), boxes)
+    if b"stsz" not in boxes or b"mdhd" not in boxes:
+        return None
+
+    mdhd = boxes[b"mdhd"]
+    timescale = struct.unpack(">I", mdhd[20:24] if mdhd[0] == 1 else mdhd[12:16])[0]
+
+    stsz = boxes[b"stsz"]
+    sample_size, sample_count = struct.unpack(">II", stsz[4:12])
+    sizes = (np.full(sample_count, sample_size, dtype=np.int64) if sample_size
+             else np.frombuffer(stsz, dtype=">u4", count=sample_count, offset=12).astype(np.int64))
+
+    stts = _table(boxes[b"stts"], 2).astype(np.int64)
+    dts = np.concatenate([[0], np.cumsum(np.repeat(stts[:, 1], stts[:, 0]))])[:sample_count]
+    cts = dts
+    if b"ctts" in boxes:
+        ctts = _table(boxes[b"ctts"], 2, ">i4").astype(np.int64)
+        cts = dts + np.repeat(ctts[:, 1], ctts[:, 0])[:sample_count]
+    if b"elst" in boxes:  # Зсув початку показу (media_time першого непорожнього сегмента)
+        elst = boxes[b"elst"]
+        wide = elst[0] == 1
+        entry = np.dtype([("duration", ">u8" if wide else ">u4"), ("media_time", ">i8" if wide else ">i4"),
+                          ("rate", ">i4")])
+        entries = np.frombuffer(elst, dtype=entry, count=struct.unpack(">I", elst[4:8])[0], offset=8)
+        media_times = entries["media_time"][entries["media_time"] >= 0]
+        if len(media_times):
+            cts = cts - int(media_times[0])
+
+    is_sync = np.ones(sample_count, dtype=bool)
+    if b"stss" in boxes:  # Без stss кожен кадр ключовий
+        is_sync[:] = False
+        is_sync[_table(boxes[b"stss"], 1)[:, 0].astype(np.int64) - 1] = True
+
+    offsets = None
+    chunk_offsets = (_table(boxes[b"co64"], 1, ">u8") if b"co64" in boxes else
+                     _table(boxes[b"stco"], 1) if b"stco" in boxes else None)
+    if chunk_offsets is not None and b"stsc" in boxes:
+        chunk_offsets = chunk_offsets[:, 0].astype(np.int64)
+        stsc = _table(boxes[b"stsc"], 3).astype(np.int64)
+        runs = np.diff(np.append(stsc[:, 0], len(chunk_offsets) + 1))
+        per_chunk = np.repeat(stsc[:, 1], runs)[:len(chunk_offsets)]
+        chunk_of_sample = np.repeat(np.arange(len(per_chunk)), per_chunk)[:sample_count]
+        size_before = np.concatenate([[0], np.cumsum(sizes)])
+        chunk_first_sample = np.concatenate([[0], np.cumsum(per_chunk)])[:-1]
+        offsets = (chunk_offsets[chunk_of_sample]
+                   + size_before[:sample_count] - size_before[chunk_first_sample[chunk_of_sample]])
+
+    order = np.argsort(cts, kind="stable")  # Порядок декодування -> порядок показу
+    return FrameIndex(cts[order] / timescale, np.flatnonzero(is_sync[order]),
+                      offsets[order] if offsets is not None else None, "mp4")
+
+
+def scan_index(filepath):
+    """Запасний варіант для інших контейнерів: час кожного кадру повним проходом без декодування зображень."""
+    cap = cv2.VideoCapture(filepath)
+    if not cap.isOpened():
+        raise IOError(f"Не вдалося відкрити відео: {filepath}")
+    pts = []
+    try:
+        while cap.grab():
+            pts.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000)
+    finally:
+        cap.release()
+    return FrameIndex(pts, [], None, "scan")
+
+
+def build_index(filepath):
+    """Індекс із таблиць MP4, а якщо це неможливо - повним проходом через OpenCV."""
+    try:
+        index = read_mp4_index(filepath)
+    except (struct.error, ValueError, IndexError, KeyError):
+        index = None
+    return index if index is not None and len(index) else scan_index(filepath)
+
+
+def parse_position(text):
+    """'120' -> номер кадру (int), '12.5s' -> час у секундах (float)."""
+    text = text.strip().lower()
+    try:
+        return float(text[:-1]) if text.endswith("s") else int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Очікується номер кадру або час із суфіксом s: {text}") from None
+
+
+def _landed(cap, frame_number, index):
+    """Чи наступним буде прочитано кадр frame_number (після переходу POS_MSEC - час попереднього кадру)."""
+    if index is None or not 0 < frame_number <= len(index):
+        return int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == frame_number
+    tolerance = 0.5 / index.fps if index.fps else 0.001
+    return abs(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000 - index.pts[frame_number - 1]) < tolerance
+
+
+def seek(cap, frame_number, index=None):
+    """Переходить так, щоб наступний cap.read() повернув кадр frame_number.
+
+    CAP_PROP_POS_FRAMES перевіряється за часом показу з індексу (номер кадру, який повідомляє
+    OpenCV, на файлах зі змінною частотою кадрів буває неточним). Якщо перехід промахнувся -
+    перехід до попереднього ключового кадру і grab() до потрібного (не більше однієї GOP),
+    а якщо й це не влучило або ключові кадри невідомі - читання з початку.
+    Піднімає IOError, якщо кадр frame_number так і не досягнуто (наприклад, його немає у файлі).
+    """
+    if frame_number <= 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+    if _landed(cap, frame_number, index):
+        return
+    keyframe = index.keyframe_before(frame_number) if index is not None else None
+    if keyframe and _grab_from(cap, keyframe, frame_number) and _landed(cap, frame_number, index):
+        return
+    if not (_grab_from(cap, 0, frame_number) and _landed(cap, frame_number, index)):
+        raise IOError(f"Не вдалося перейти до кадру {frame_number}")
+
+
+def _grab_from(cap, position, frame_number):
+    """Перехід до кадру position і grab() до frame_number; False, якщо кадри скінчились раніше."""
+    cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+    return all(cap.grab() for _ in range(frame_number - position))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Індекс кадрів відео (час показу та ключові кадри)")
+    parser.add_argument("video", help="Шлях до відеофайлу")
+    args = parser.parse_args(argv)
+
+    index = build_index(args.video)
+    print(f"{args.video}: {len(index)} кадрів ({index.source}), {index.fps:.2f} кадр/с, "
+          f"тривалість {index.pts[-1] if len(index) else 0:.2f} с, ключових кадрів {len(index.keyframes)}")
+    if len(index.keyframes) > 1:
+        gop = np.diff(index.keyframes)
+        print(f"GOP: середній {gop.mean():.1f}, найбільший {gop.max()} кадрів")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zlib
+
+import numpy as np
+
+from config import video_roi
+
+CACHE_DIR = os.environ.get("VIDEOSCRAP_CACHE_DIR",
+                           os.path.join(os.path.expanduser("~"), ".cache", "videoscrap", "masks"))
+CACHE_LIMIT_MB = float(os.environ.get("VIDEOSCRAP_CACHE_MB", "2048"))  # Бюджет розміру кешу на диску
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+DATA_FILE = "masks.bin"
+OFFSETS_FILE = "offsets.npy"
+FINGERPRINT_CHUNK = 1 << 20  # Скільки байтів з початку і кінця файлу враховується в хеші відео
+
+
+def video_fingerprint(filepath):
+    """Хеш відео за розміром і першим/останнім мегабайтом (без читання всього файлу)."""
+    size = os.path.getsize(filepath)
+    digest = hashlib.sha1(str(size).encode())
+    with open(filepath, "rb") as f:
+        digest.update(f.read(FINGERPRINT_CHUNK))
+        if size > FINGERPRINT_CHUNK:
+            f.seek(max(FINGERPRINT_CHUNK, size - FINGERPRINT_CHUNK))
+            digest.update(f.read(FINGERPRINT_CHUNK))
+    return digest.hexdigest()
+
+
+def mask_params(settings, filepath):
+    """Налаштування, від яких залежить маска переднього плану (у тому вигляді, як їх використовує VideoProcessor).
+
+    Ворота зіставлення та параметри трекера сюди не входять - їх можна змінювати без перерахунку
+    масок. min_contour_area входить лише при motion_threshold > 0: чи пропускається статичний кадр,
+    залежить від того, чи були рамки на попередньому (VideoProcessor._static).
+    """
+    params = {
+        "history": int(settings["history"]),
+        "varThreshold": int(settings["varThreshold"]),
+        "processing_scale": min(1.0, float(settings.get("processing_scale", 1.0))),
+        "frame_stride": max(1, int(settings.get("frame_stride", 1))),
+        "motion_threshold": float(settings.get("motion_threshold", 0)),  # Статичні кадри - порожні маски
+        "roi": video_roi(settings, filepath),
+    }
+    if params["motion_threshold"] > 0:
+        params["min_contour_area"] = float(settings["min_contour_area"])
+    return params
+
+
+def cache_key(filepath, settings):
+    payload = json.dumps({"video": video_fingerprint(filepath), "version": FORMAT_VERSION,
+                          "params": mask_params(settings, filepath)}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class MaskWriter:
+    """Запис масок одного прогону у тимчасовий каталог; у кеш він потрапляє лише після commit().
+
+    Кожна маска зберігається як упаковані біти (np.packbits, 1 біт на піксель), стиснуті zlib:
+    порожні ділянки маски стискаються до кількох байтів.
+    """
+
+    def __init__(self, cache, key, fps):
+        self.cache = cache
+        self.key = key
+        self.fps = fps
+        self.shape = None
+        os.makedirs(cache.root, exist_ok=True)
+        self._tmp_dir = tempfile.mkdtemp(prefix=f".{key}.", dir=cache.root)
+        self._data = open(os.path.join(self._tmp_dir, DATA_FILE), "wb")
+        self._offsets = [0]
+
+    def add(self, fg_mask):
+        if self.shape is None:
+            self.shape = fg_mask.shape
+        chunk = zlib.compress(np.packbits(fg_mask, axis=None).tobytes(), 1)
+        self._data.write(chunk)
+        self._offsets.append(self._offsets[-1] + len(chunk))
+
+    def commit(self, offset=(0, 0)):
+        """Завершує запис; offset - зсув ROI, з яким рамки переводяться в координати повного кадру."""
+        self._data.close()
+        np.save(os.path.join(self._tmp_dir, OFFSETS_FILE), np.asarray(self._offsets, dtype=np.int64))
+        meta = {"version": FORMAT_VERSION, "fps": self.fps, "frames": len(self._offsets) - 1,
+                "shape": list(self.shape or (0, 0)), "offset": [int(v) for v in offset]}
+        with open(os.path.join(self._tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        try:
+            os.replace(self._tmp_dir, self.cache.entry_path(self.key))
+        except OSError:  # Той самий запис уже зберіг інший процес
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+        self._tmp_dir = None
+        self.cache.evict(keep=self.key)
+
+    def close(self):
+        """Відкидає незавершений запис (наприклад, після помилки або зупинки)."""
+        if self._tmp_dir is not None:
+            self._data.close()
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+
+
+class MaskReader:
+    """Послідовне читання масок із запису кешу."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.fps = self.meta["fps"]
+        self.shape = tuple(self.meta["shape"])
+        self.offset = tuple(self.meta["offset"])
+        self._offsets = np.load(os.path.join(path, OFFSETS_FILE))
+        self._data_path = os.path.join(path, DATA_FILE)
+
+    def __len__(self):
+        return self.meta["frames"]
+
+    def __iter__(self):
+        count = self.shape[0] * self.shape[1]
+        with open(self._data_path, "rb") as f:
+            for size in np.diff(self._offsets):
+                bits = np.frombuffer(zlib.decompress(f.read(int(size))), dtype=np.uint8)
+                fg_mask = np.unpackbits(bits, count=count).reshape(self.shape)
+                fg_mask *= 255
+                yield fg_mask
+
+
+class MaskCache:
+    """Каталог записів масок, ключ - хеш відео та параметрів MOG2; старі записи витісняються (LRU)."""
+
+    def __init__(self, root=CACHE_DIR, limit_mb=CACHE_LIMIT_MB):
+        self.root = root
+        self.limit_bytes = int(limit_mb * 1024 * 1024)
+
+    def entry_path(self, key):
+        return os.path.join(self.root, key)
+
+    def get(self, key):
+        """MaskReader для ключа або None; звернення оновлює час останнього використання."""
+        meta_path = os.path.join(self.entry_path(key), META_FILE)
+        try:
+            reader = MaskReader(self.entry_path(key))
+        except (OSError, ValueError, KeyError):
+            return None
+        if reader.meta.get("version") != FORMAT_VERSION:
+            return None
+        os.utime(meta_path)
+        return reader
+
+    def writer(self, key, fps):
+        return MaskWriter(self, key, fps)
+
+    def entries(self):
+        """[(час останнього використання, розмір у байтах, ключ), ...] від найстаріших."""
+        if not os.path.isdir(self.root):
+            return []
+        entries = []
+        for key in os.listdir(self.root):
+            path = self.entry_path(key)
+            try:
+                last_used = os.path.getmtime(os.path.join(path, META_FILE))
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+            except OSError:  # Незавершений запис або запис, який саме видаляє інший процес
+                continue
+            entries.append((last_used, size, key))
+        return sorted(entries)
+
+    def evict(self, keep=None):
+        """Видаляє найдавніше використані записи, доки кеш не вкладеться в бюджет."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.limit_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
+            total -= size
+        return total
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Кеш масок переднього плану")
+    parser.add_argument("--dir", default=CACHE_DIR, help="Каталог кешу")
+    parser.add_argument("--clear", action="store_true", help="Видалити весь кеш")
+    args = parser.parse_args(argv)
+
+    cache = MaskCache(args.dir)
+    if args.clear:
+        cache.clear()
+        return
+    entries = cache.entries()
+    for _, size, key in entries:
+        frames = len(MaskReader(cache.entry_path(key)))  # Без get(), щоб не змінювати порядок LRU
+        print(f"{key}: {frames} кадрів, {size / (1024 * 1024):.1f} МБ")
+    print(f"Усього: {len(entries)} записів, {sum(size for _, size, _ in entries) / (1024 * 1024):.1f} МБ "
+          f"з {cache.limit_bytes / (1024 * 1024):.0f} МБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+WINDOW = 300  # Скільки останніх вимірів зберігати для процентилів та FPS
+OVERLAY_MAX_AGE = 0.2  # Як довго (с) рядок для накладання використовується без перерахунку
+
+
+def percentile(values, q):
+    """Процентиль q (0-100) відсортованого списку (найближчий ранг)."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class StageTimer:
+    """Час стадій конвеєра (монотонний годинник): сумарний і ковзне вікно для процентилів.
+
+    Запис - лише додавання до deque, тож вимірювання можна лишати ввімкненим постійно;
+    сортування для процентилів відбувається тільки під час звіту.
+    """
+
+    def __init__(self, window=WINDOW, source_fps=None):
+        self.totals = {}
+        self.counts = {}
+        self.recent = {}
+        self.gauges = {}  # Миттєві значення: глибина черг, відкинуті кадри тощо
+        self.window = window
+        self.source_fps = source_fps  # FPS джерела - для порівняння з реальним часом
+        self._frame_times = deque(maxlen=window)
+        self._overlay = (None, "")  # (момент побудови, текст) - кеш format_overlay
+
+    def add(self, stage, seconds):
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+        recent = self.recent.get(stage)
+        if recent is None:
+            recent = self.recent[stage] = deque(maxlen=self.window)
+        recent.append(seconds)
+
+    @contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def frame_done(self):
+        """Позначає завершення обробки кадру (для ковзного FPS)."""
+        self._frame_times.append(time.perf_counter())
+
+    def fps(self):
+        times = list(self._frame_times)
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def summary(self):
+        """{стадія: {"total_s": ..., "calls": ..., "mean_ms": ...}}"""
+        return {stage: {"total_s": total, "calls": self.counts[stage],
+                        "mean_ms": total / self.counts[stage] * 1000}
+                for stage, total in list(self.totals.items())}
+
+    def snapshot(self):
+        """Поточний стан: ковзні процентилі по стадіях (мс), FPS, відставання від реального часу, gauges."""
+        stages = {}
+        for stage, recent in list(self.recent.items()):
+            values = sorted(recent)
+            stages[stage] = {f"p{q}_ms": percentile(values, q) * 1000 for q in (50, 95, 99)}
+        fps = self.fps()
+        return {
+            "fps": fps,
+            "realtime_ratio": fps / self.source_fps if self.source_fps else None,
+            "stages": stages,
+            "gauges": dict(self.gauges),
+        }
+
+    def format_overlay(self, max_age=OVERLAY_MAX_AGE):
+        """Короткий рядок для накладання на відео; перераховується не частіше ніж раз на max_age с."""
+        now = time.perf_counter()
+        built, text = self._overlay
+        if built is not None and now - built < max_age:
+            return text
+        snapshot = self.snapshot()
+        text = f"FPS {snapshot['fps']:.1f}"
+        latency = snapshot["stages"].get("latency")
+        if latency:
+            text += f" | затримка p50 {latency['p50_ms']:.0f} / p95 {latency['p95_ms']:.0f} мс"
+        if snapshot["realtime_ratio"] is not None and snapshot["realtime_ratio"] < 0.95:
+            text += " | ВІДСТАЄ"
+        self._overlay = (now, text)
+        return text
+
+    def format_log(self):
+        snapshot = self.snapshot()
+        parts = [f"{stage} p50={values['p50_ms']:.1f} p95={values['p95_ms']:.1f} мс"
+                 for stage, values in snapshot["stages"].items()]
+        parts += [f"{name}={value}" for name, value in snapshot["gauges"].items()]
+        return f"FPS {snapshot['fps']:.1f}; " + "; ".join(parts)
+
+    def to_prometheus(self, prefix="videoscrap"):
+        """Метрики в текстовому форматі Prometheus (для node_exporter textfile collector)."""
+        snapshot = self.snapshot()
+        lines = [f"# TYPE {prefix}_fps gauge", f"{prefix}_fps {snapshot['fps']:.3f}"]
+        if snapshot["realtime_ratio"] is not None:
+            lines += [f"# TYPE {prefix}_realtime_ratio gauge",
+                      f"{prefix}_realtime_ratio {snapshot['realtime_ratio']:.3f}"]
+        lines.append(f"# TYPE {prefix}_stage_seconds summary")
+        for stage, values in snapshot["stages"].items():
+            for q in (50, 95, 99):
+                lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="{q / 100}"}} '
+                             f'{values[f"p{q}_ms"] / 1000:.6f}')
+        for stage, total in list(self.totals.items()):
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {self.counts[stage]}')
+        for name, value in snapshot["gauges"].items():
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Атомарно перезаписує файл метрик (щоб збирач не прочитав його наполовину)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+class StatsReporter:
+    """Фоновий потік, який раз на interval секунд друкує статистику та/або пише файл Prometheus."""
+
+    def __init__(self, timer, interval=10.0, log=True, prometheus_path=None):
+        self.timer = timer
+        self.interval = interval
+        self.log = log
+        self.prometheus_path = prometheus_path
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _report(self):
+        if self.log:
+            print(self.timer.format_log(), flush=True)
+        if self.prometheus_path:
+            self.timer.write_prometheus(self.prometheus_path)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self._report()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+        self._report()
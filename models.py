@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from db import Base
@@ -47,3 +47,40 @@ class ProcessedVideo(Base):
     velocity = Column(Float, nullable=False)  # Швидкість руху
 
     video = relationship("Video", back_populates="processed_video")
+
+    __table_args__ = (
+        Index("ix_processed_videos_video_object_frame", "video_id", "object_id", "frame_number"),
+        Index("ix_processed_videos_video_frame", "video_id", "frame_number"),
+    )
+
+### **Таблиця підсумків по треках (оновлюється під час запису результатів)**
+class TrackSummary(Base):
+    __tablename__ = "track_summaries"
+
+    video_id = Column(Integer, ForeignKey("videos.id"), primary_key=True)
+    object_id = Column(String, primary_key=True)
+    first_frame = Column(Integer, nullable=False)
+    last_frame = Column(Integer, nullable=False)
+    samples = Column(Integer, nullable=False)  # Кількість записаних рядків
+    path_length = Column(Float, nullable=False)  # Сума переміщень, мм
+    mean_velocity = Column(Float, nullable=False)  # Середня швидкість від початку треку (з останнього рядка), мм/с
+    max_velocity = Column(Float, nullable=False)  # Найбільша швидкість між сусідніми вибірками, мм/с
+    min_x = Column(Float, nullable=False)
+    max_x = Column(Float, nullable=False)
+    min_y = Column(Float, nullable=False)
+    max_y = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_track_summaries_video_max_velocity", "video_id", "max_velocity"),
+    )
+
+### **Таблиця індексів кадрів (час показу та ключові кадри відео)**
+class VideoIndex(Base):
+    __tablename__ = "video_indexes"
+
+    video_id = Column(Integer, ForeignKey("videos.id"), primary_key=True)
+    source = Column(String, nullable=False)  # "mp4" - з таблиць контейнера, "scan" - прохід через OpenCV
+    frame_count = Column(Integer, nullable=False)
+    keyframe_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)  # frameindex.FrameIndex.to_bytes()
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,36 @@
+import cv2
+
+GATE_WIDTH = 64  # Ширина зменшеного кадру для перевірки руху (px)
+REFRESH_EVERY = 10  # На кожному n-му статичному кадрі MOG2 все ж оновлює модель фону
+MIN_LEARNED_FRAMES = 30  # Перші кадри завжди обробляються повністю, поки MOG2 вивчає фон
+
+
+class MotionGate:
+    """Дешева перевірка, чи змінився кадр відносно останнього повністю обробленого.
+
+    Кадр зменшується до GATE_WIDTH пікселів завширшки (INTER_AREA усереднює блоки, тож шум
+    сенсора майже зникає) і порівнюється з опорним. Рух є, якщо хоч один блок змінився
+    більше ніж на threshold рівнів яскравості.
+    """
+
+    def __init__(self, threshold, width=GATE_WIDTH):
+        self.threshold = threshold
+        self.width = width
+        self.reference = None
+        self._small = None
+
+    def _shrink(self, frame):
+        height = max(1, round(frame.shape[0] * self.width / frame.shape[1]))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def moving(self, frame):
+        """True, якщо кадр відрізняється від опорного (або опорного ще немає)."""
+        self._small = self._shrink(frame)
+        if self.reference is None or self.reference.shape != self._small.shape:
+            return True
+        return cv2.absdiff(self._small, self.reference).max() > self.threshold
+
+    def set_reference(self):
+        """Кадр з останнього виклику moving() стає опорним."""
+        self.reference = self._small
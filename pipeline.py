@@ -0,0 +1,163 @@
+import queue
+import threading
+import time
+
+_END = object()  # Маркер кінця потоку кадрів
+
+
+def read_frame(cap, stride=1):
+    """Читає наступний аналізований кадр, пропускаючи stride - 1 кадрів без перетворення (grab)."""
+    ret, frame = cap.read()
+    for _ in range(stride - 1):
+        if not cap.grab():
+            break
+    return ret, frame
+
+
+
+class FramePipeline:
+    """Конвеєр декодування -> виявлення -> відображення на окремих потоках.
+
+    Стадії з'єднані обмеженими чергами: якщо виявлення не встигає, декодер блокується
+    (зворотний тиск), тож пам'ять не росте. Кадри можуть відкидатися лише перед
+    відображенням (drop_frames=True) - аналіз завжди отримує кожен кадр.
+    cap.read() та виклики OpenCV відпускають GIL, тому стадії справді працюють паралельно.
+    """
+
+    def __init__(self, cap, processor, render=None, on_result=None, queue_size=8,
+                 drop_frames=True, frame_delay=0, stop_event=None, live=False, frame_limit=None):
+        self.cap = cap
+        self.processor = processor
+        self.render = render  # render(frame, visible) - на потоці відображення
+        self.on_result = on_result  # on_result(frame_count, visible, rows) - на потоці виявлення
+        self.drop_frames = drop_frames
+        self.frame_delay = frame_delay  # Затримка між кадрами декодера (відтворення в реальному часі)
+        self.stop_event = stop_event or threading.Event()
+        self.frame_limit = frame_limit  # Найбільша кількість аналізованих кадрів (обробка діапазону)
+        # live=True: cap - stream.LatestFrameGrabber. Черга декодування на один кадр, щоб затримка
+        # не накопичувалась, а номер кадру джерела передається трекеру (між кадрами є пропуски).
+        self.live = live
+        if live:
+            queue_size, self.frame_delay = 1, 0
+
+        self.decode_queue = queue.Queue(maxsize=queue_size)
+        self.render_queue = queue.Queue(maxsize=queue_size)
+        self.dropped_frames = 0
+        self.timer = processor.timer  # metrics.StageTimer процесора, якщо вимірювання ввімкнене
+
+    def _put(self, q, item):
+        """Блокуючий put, який не зависає після зупинки конвеєра."""
+        while not self.stop_event.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while not self.stop_event.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _decode(self):
+        stride = self.processor.frame_stride
+        last_frame_time = time.time()
+        decoded = 0
+        try:
+            while self.cap.isOpened() and not self.stop_event.is_set():
+                if self.frame_limit is not None and decoded >= self.frame_limit:
+                    break
+                decode_start = time.perf_counter()
+                if self.live:  # Кадри відкидає сам LatestFrameGrabber, тож frame_stride не застосовується
+                    ret, frame, frame_number = self.cap.read_numbered()
+                else:
+                    ret, frame = read_frame(self.cap, stride)
+                    frame_number = None
+                if not ret:
+                    break
+                decoded += 1
+                if self.timer:
+                    self.timer.add("decode", time.perf_counter() - decode_start)
+                if not self._put(self.decode_queue, (frame, decode_start, frame_number)):
+                    break
+
+                if self.frame_delay:
+                    time_to_wait = self.frame_delay * stride - (time.time() - last_frame_time)
+                    if time_to_wait > 0:
+                        time.sleep(time_to_wait)
+                    last_frame_time = time.time()
+        finally:
+            self._put(self.decode_queue, _END)
+
+    def _detect(self):
+        try:
+            while True:
+                item = self._get(self.decode_queue)
+                if item is _END:
+                    break
+                frame, decode_start, frame_number = item
+                visible, rows = self.processor.process_frame(frame, frame_number)
+                frame_count = self.processor.frame_count - self.processor.frame_stride
+                if self.timer:
+                    self.timer.add("latency", time.perf_counter() - decode_start)  # Від початку декодування
+                    self.timer.frame_done()
+                    self.timer.set_gauge("decode_queue_depth", self.decode_queue.qsize())
+                    self.timer.set_gauge("render_queue_depth", self.render_queue.qsize())
+                    self.timer.set_gauge("dropped_frames", self.dropped_frames)
+                    if self.live:
+                        self.timer.set_gauge("source_dropped_frames", self.cap.dropped_frames)
+                if self.on_result:
+                    self.on_result(frame_count, visible, rows)
+                if self.render:
+                    self._put_for_render((frame, visible))
+        finally:
+            if self.render:
+                self._put(self.render_queue, _END)
+
+    def _put_for_render(self, item):
+        if not self.drop_frames:
+            self._put(self.render_queue, item)
+            return
+        while True:
+            try:
+                self.render_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.render_queue.get_nowait()  # Відкидаємо найстаріший кадр
+                    self.dropped_frames += 1
+                except queue.Empty:
+                    pass
+
+    def _render(self):
+        while True:
+            item = self._get(self.render_queue)
+            if item is _END:
+                break
+            frame, visible = item
+            if self.timer:
+                with self.timer.measure("render"):
+                    self.render(frame, visible)
+            else:
+                self.render(frame, visible)
+
+    def run(self):
+        """Запускає всі стадії й чекає на завершення; виявлення йде на поточному потоці."""
+        threads = [threading.Thread(target=self._decode, daemon=True)]
+        if self.render:
+            threads.append(threading.Thread(target=self._render, daemon=True))
+        for thread in threads:
+            thread.start()
+        try:
+            self._detect()
+        except BaseException:
+            self.stop_event.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+        return self.processor.tracked_data
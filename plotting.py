@@ -0,0 +1,145 @@
+import numpy as np
+
+from columnar import COLUMNS, TrackReader
+
+POINTS_PER_PIXEL = 2  # min і max на кожен піксель ширини осей
+MARKER_MAX_POINTS = 200  # Маркери точок лише на коротких серіях, на довгих вони зливаються в лінію
+MAX_LEGEND_ENTRIES = 20  # Легенда на сотні об'єктів нечитабельна і дорого малюється
+MAX_PATH_POINTS = 2000  # Точок на траєкторію (X vs Y), яку не можна проріджувати за віссю X
+SETTLE_MS = 250  # Повне перемальовування (осі, сітка) після паузи у взаємодії
+
+
+def series_arrays(data, x_key, y_key):
+    """Генерує (obj_id, x, y) з масивами float64 для кожного об'єкта.
+
+    data - звичайна структура tracked_data або columnar.TrackReader (читається напряму зі стовпців,
+    без створення словника на кожен рядок).
+    """
+    if isinstance(data, TrackReader):
+        names = {key: name for name, (key, _) in COLUMNS.items()}
+        for obj_id in data.object_ids:
+            columns = data.object(obj_id)
+            yield obj_id, columns[names[x_key]].astype(np.float64), columns[names[y_key]].astype(np.float64)
+        return
+    for obj_id, entries in data.items():
+        x = np.fromiter((entry[x_key] for entry in entries), dtype=np.float64, count=len(entries))
+        y = np.fromiter((entry[y_key] for entry in entries), dtype=np.float64, count=len(entries))
+        yield obj_id, x, y
+
+
+def _halve(x, y):
+    """Наступний рівень деталізації: кожні 4 точки (дві пари min/max) -> одна пара min/max."""
+    pad = -len(x) % 4
+    if pad:
+        x = np.concatenate([x, np.repeat(x[-1:], pad)])
+        y = np.concatenate([y, np.repeat(y[-1:], pad)])
+    x4, y4 = x.reshape(-1, 4), y.reshape(-1, 4)
+    rows = np.arange(len(y4))
+    low, high = y4.argmin(axis=1), y4.argmax(axis=1)
+    first, second = np.minimum(low, high), np.maximum(low, high)  # Порядок точок за X зберігається
+    return (np.column_stack([x4[rows, first], x4[rows, second]]).ravel(),
+            np.column_stack([y4[rows, first], y4[rows, second]]).ravel())
+
+
+def build_levels(x, y, min_points=256):
+    """Піраміда min/max-проріджування: рівень i містить ~len(x) / 2**i точок; x має бути відсортованим.
+
+    Будується один раз за O(n); під час масштабування лише вибирається рівень і зріз.
+    """
+    levels = [(x, y)]
+    while len(levels[-1][0]) > min_points:
+        levels.append(_halve(*levels[-1]))
+    return levels
+
+
+def visible_points(levels, x_min, x_max, width):
+    """Точки для діапазону [x_min, x_max] на осях шириною width пікселів (по одній точці за межами з кожного боку)."""
+    x = levels[0][0]
+    visible = np.searchsorted(x, x_max, "right") - np.searchsorted(x, x_min, "left")
+    target = max(1, int(width)) * POINTS_PER_PIXEL
+    level = 0 if visible <= target else min(len(levels) - 1, int(np.ceil(np.log2(visible / target))))
+    x, y = levels[level]
+    start = max(0, np.searchsorted(x, x_min, "left") - 1)
+    stop = np.searchsorted(x, x_max, "right") + 1
+    return x[start:stop], y[start:stop]
+
+
+def decimate_path(x, y, max_points=MAX_PATH_POINTS):
+    """Рівномірне проріджування траєкторії за індексом (перша й остання точки зберігаються)."""
+    if len(x) <= max_points:
+        return x, y
+    index = np.unique(np.linspace(0, len(x) - 1, max_points).round().astype(np.intp))
+    return x[index], y[index]
+
+
+class DecimatedPlot:
+    """Лінії з рівнями деталізації на осях matplotlib.
+
+    На екран потрапляє лише видимий діапазон X, проріджений до POINTS_PER_PIXEL точок на піксель
+    (min/max, тож піки не губляться). Під час масштабування та перетягування лінії перемальовуються
+    блітингом поверх збереженого фону, а повне перемальовування (осі, сітка) - після паузи SETTLE_MS.
+    """
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.series = []  # [(line, levels), ...]
+        self._view = None
+        self._background = None
+        self._settle_timer = None
+        ax.figure.canvas.mpl_connect("draw_event", self._on_draw)
+
+    @property
+    def canvas(self):
+        return self.ax.figure.canvas  # Полотно може бути замінене (FigureCanvasTkAgg) після створення
+
+    def plot(self, x, y, **kwargs):
+        """Додає серію; повертає Line2D. Дані відображаються після першого малювання фігури."""
+        x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+        if len(x) > 1 and np.any(np.diff(x) < 0):
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+        line, = self.ax.plot(x[:0], y[:0], animated=True, **kwargs)
+        if len(x):
+            self.ax.update_datalim([(x[0], y.min()), (x[-1], y.max())])
+            self.ax.autoscale_view()
+        self.series.append((line, build_levels(x, y)))
+        self._view = None
+        return line
+
+    def refresh(self):
+        """Перераховує видимі точки, якщо змінились межі X або ширина осей; повертає True, якщо змінились."""
+        x_min, x_max = self.ax.get_xlim()
+        width = int(self.ax.bbox.width)
+        if (x_min, x_max, width) == self._view:
+            return False
+        self._view = (x_min, x_max, width)
+        for line, levels in self.series:
+            x, y = visible_points(levels, x_min, x_max, width)
+            line.set_data(x, y)
+            line.set_marker("o" if len(x) <= MARKER_MAX_POINTS else "")
+        return True
+
+    def _draw_lines(self):
+        for line, _ in self.series:
+            self.ax.draw_artist(line)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self.refresh()
+        self._draw_lines()
+
+    def update_view(self):
+        """Швидке оновлення після зміни меж осей: лише лінії, без перемальовування осей."""
+        self.refresh()
+        if self._background is None or not self.canvas.supports_blit:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_lines()
+        self.canvas.blit(self.ax.figure.bbox)
+        if self._settle_timer is None:
+            self._settle_timer = self.canvas.new_timer(interval=SETTLE_MS)
+            self._settle_timer.single_shot = True
+            self._settle_timer.add_callback(self.canvas.draw_idle)
+        self._settle_timer.stop()
+        self._settle_timer.start()
@@ -0,0 +1,517 @@
+import argparse
+import json
+import os
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from association import associate, resolve_method
+from columnar import COLUMNAR_SUFFIX, save_columnar
+from config import SETTINGS_FILE, load_settings, video_roi
+from frameindex import build_index, parse_position, seek
+from export import BOXES_SUFFIX, AnnotationExporter, pack_boxes, save_boxes
+from maskcache import CACHE_DIR, MaskCache, cache_key
+from metrics import StageTimer, StatsReporter
+from motion import MIN_LEARNED_FRAMES, REFRESH_EVERY, MotionGate
+from pipeline import FramePipeline, read_frame
+from tracks import TrackStore, TrackedObject
+
+PIXEL_TO_MM = 0.1
+SAMPLE_EVERY = 5  # Кожен n-й кадр потрапляє в таблицю та tracked_data
+
+
+def find_blobs(fg_mask, min_area):
+    """Знаходить усі плями маски одним викликом; повертає масиви (areas, boxes, centroids).
+
+    boxes має форму (N, 4) зі стовпцями x, y, w, h; centroids - (N, 2) центри мас.
+    Плями з площею (у пікселях) не більше min_area відкидаються маскою масиву.
+    """
+    _, _, stats, centroids = cv2.connectedComponentsWithStats(fg_mask, connectivity=8)
+    stats, centroids = stats[1:], centroids[1:]  # Мітка 0 - фон
+    keep = stats[:, cv2.CC_STAT_AREA] > min_area
+    return stats[keep, cv2.CC_STAT_AREA], stats[keep, :cv2.CC_STAT_AREA], centroids[keep]
+
+
+def build_roi_region(roi, frame_shape):
+    """Готує ROI для кадру розміру frame_shape (h, w).
+
+    Повертає ((x0, y0, x1, y1), mask): прямокутник обрізання у пікселях повного кадру та маску
+    розміру обрізаного кадру. mask = None, якщо прямокутник повністю всередині ROI
+    і маскувати нічого не треба.
+    """
+    height, width = frame_shape
+    full_mask = np.zeros((height, width), dtype=np.uint8)
+    include = [np.asarray(polygon, dtype=np.int32) for polygon in roi.get("include") or []]
+    if include:
+        cv2.fillPoly(full_mask, include, 255)
+    else:
+        full_mask[:] = 255
+    exclude = [np.asarray(polygon, dtype=np.int32) for polygon in roi.get("exclude") or []]
+    if exclude:
+        cv2.fillPoly(full_mask, exclude, 0)
+
+    points = cv2.findNonZero(full_mask)
+    if points is None:
+        raise ValueError("ROI не містить жодного пікселя кадру")
+    x, y, w, h = cv2.boundingRect(points)
+    mask = full_mask[y:y + h, x:x + w]
+    return (x, y, x + w, y + h), None if cv2.countNonZero(mask) == mask.size else mask
+
+
+class VideoProcessor:
+    """Виявлення та відстеження об'єктів без GUI і без прив'язки до швидкості відтворення.
+
+    Час для відстеження рахується за номером кадру (frame_count / fps), а не за годинником,
+    тому результат не залежить від того, наскільки швидко обробляються кадри.
+    """
+
+    def __init__(self, settings, fps=30, roi=None, subtractor=True):
+        self.settings = settings
+        self.roi = roi  # {"include": [полігони], "exclude": [полігони]} у пікселях повного кадру
+        self._roi_region = None
+        self.fps = fps if fps and fps > 0 else 30
+        self.back_sub = None  # subtractor=False - лише трекер: рамки або маски надходять ззовні
+        if subtractor:
+            self.back_sub = cv2.createBackgroundSubtractorMOG2(
+                history=int(settings["history"]),
+                varThreshold=int(settings["varThreshold"]),
+                detectShadows=True
+            )
+        self.max_disappear_time = settings.get("max_disappear_time", 1.0)
+        self.min_visible_time = settings.get("min_visible_time", 1.0)
+        self.min_contour_area = settings.get("min_contour_area", 1000)
+        self.match_distance = settings.get("match_distance", 50)
+        self.association = resolve_method(settings.get("association", "greedy"))
+        self.processing_scale = min(1.0, float(settings.get("processing_scale", 1.0)))
+        self.frame_stride = max(1, int(settings.get("frame_stride", 1)))
+        self.frame_interval = self.frame_stride / self.fps  # Час між кадрами, які справді аналізуються
+
+        self.object_data = {}
+        self.object_id_counter = -1
+        self.tracked_data = TrackStore()
+        self.frame_count = 0
+        self.timer = None  # metrics.StageTimer для вимірювання часу стадій (None - вимкнено)
+        self.mask_recorder = None  # maskcache.MaskWriter: запис масок переднього плану в кеш
+        motion_threshold = float(settings.get("motion_threshold", 0))
+        self.motion_gate = MotionGate(motion_threshold) if motion_threshold > 0 else None
+        self.static_frames = 0  # Кадри, на яких повне виявлення пропущено (немає руху)
+        self._had_boxes = False
+        self._learned_frames = 0
+
+    def _measure(self, stage):
+        return self.timer.measure(stage) if self.timer else nullcontext()
+
+    def detect(self, frame):
+        """Повертає рамки (x, y, w, h) рухомих об'єктів на кадрі (у координатах повного кадру).
+
+        При processing_scale < 1 MOG2 працює на зменшеному сірому зображенні, а поріг площі
+        та рамки перераховуються до повної роздільності.
+        """
+        frame, roi_mask = self.preprocess(frame)
+        if self.motion_gate is not None and self._static(frame):
+            if self.mask_recorder is not None:
+                self.mask_recorder.add(np.zeros(frame.shape[:2], dtype=np.uint8))
+            return []
+        fg_mask = self.mask_of(frame, roi_mask)
+        if self.mask_recorder is not None:
+            self.mask_recorder.add(fg_mask)
+        boxes = self.boxes_from_mask(fg_mask, self.roi_offset())
+        if self.motion_gate is not None:
+            self.motion_gate.set_reference()
+            self._had_boxes = bool(boxes)
+        return boxes
+
+    def _static(self, frame):
+        """Чи можна пропустити повне виявлення: кадр без змін, і на попередньому не було об'єктів.
+
+        На статичному кадрі MOG2 оновлює фон лише раз на motion.REFRESH_EVERY кадрів (без морфології
+        та контурів). Трекер отримує порожній список рамок, тож час і вибірки лишаються такими ж.
+        """
+        with self._measure("gate"):
+            moving = self.motion_gate.moving(frame)
+        if moving or self._had_boxes or self._learned_frames < MIN_LEARNED_FRAMES:
+            return False
+        self.static_frames += 1
+        if self.static_frames % REFRESH_EVERY == 0:
+            with self._measure("mog2"):
+                self.back_sub.apply(frame)
+            self._learned_frames += 1
+        return True
+
+    def roi_offset(self):
+        """Зсув (x0, y0) обрізаного за ROI кадру відносно повного кадру."""
+        return self._roi_region[0][:2] if self._roi_region else (0, 0)
+
+    def foreground(self, frame):
+        """Бінарна маска переднього плану (після MOG2 і морфології) у координатах обробленого кадру."""
+        return self.mask_of(*self.preprocess(frame))
+
+    def preprocess(self, frame):
+        """Кадр для MOG2 (обрізаний за ROI, зменшений) та маска ROI під нього (або None)."""
+        roi_mask = None
+        scale = self.processing_scale
+        with self._measure("preprocess"):
+            if self.roi:
+                if self._roi_region is None:
+                    self._roi_region = build_roi_region(self.roi, frame.shape[:2])
+                (x0, y0, x1, y1), roi_mask = self._roi_region
+                frame = frame[y0:y1, x0:x1]  # Лише обмежувальний прямокутник ROI (без копіювання)
+
+            if scale < 1.0:
+                frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                if frame.ndim == 3:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if roi_mask is not None:
+                if roi_mask.shape != frame.shape[:2]:  # Маска під зменшений кадр - один раз
+                    roi_mask = cv2.resize(roi_mask, (frame.shape[1], frame.shape[0]),
+                                          interpolation=cv2.INTER_NEAREST)
+                    self._roi_region = (self._roi_region[0], roi_mask)
+                frame = cv2.bitwise_and(frame, frame, mask=roi_mask)
+        return frame, roi_mask
+
+    def mask_of(self, frame, roi_mask=None):
+        """MOG2 і морфологія для кадру після preprocess()."""
+        with self._measure("mog2"):
+            fg_mask = self.back_sub.apply(frame)
+        self._learned_frames += 1
+        with self._measure("morphology"):
+            _, fg_mask = cv2.threshold(fg_mask, 50, 255, cv2.THRESH_BINARY)
+            fg_mask = cv2.medianBlur(fg_mask, 5)
+            if roi_mask is not None:
+                fg_mask = cv2.bitwise_and(fg_mask, roi_mask)
+        return fg_mask
+
+    def boxes_from_mask(self, fg_mask, offset=(0, 0)):
+        """Рамки плям маски з урахуванням min_contour_area, перераховані до повного кадру."""
+        scale = self.processing_scale
+        with self._measure("contours"):
+            _, boxes, _ = find_blobs(fg_mask, self.min_contour_area * scale * scale)
+        if scale < 1.0:
+            boxes = np.rint(boxes / scale).astype(boxes.dtype)
+        x0, y0 = offset
+        if x0 or y0:
+            boxes[:, 0] += x0
+            boxes[:, 1] += y0
+        return boxes.tolist()
+
+    def track(self, boxes, current_time):
+        """Зіставляє рамки з відомими об'єктами; повертає видимі об'єкти [(obj_id, (x, y, w, h)), ...]."""
+        visible = []
+        centers = [(x + w // 2, y + h // 2) for x, y, w, h in boxes]
+        known_ids = list(self.object_data)
+        matches = associate(centers, [self.object_data[obj_id].coords for obj_id in known_ids],
+                            self.match_distance, self.association)
+
+        for i, (x, y, w, h) in enumerate(boxes):
+            size_mm = (w * h) * PIXEL_TO_MM
+            cx, cy = centers[i]
+
+            matched_id = known_ids[matches[i]] if i in matches else None
+            if matched_id is None:
+                self.object_id_counter += 1
+                matched_id = f"ID_{self.object_id_counter}"
+                self.object_data[matched_id] = TrackedObject((cx, cy), size_mm, current_time)
+
+            data = self.object_data[matched_id]
+            prev_coords = data.coords
+            distance = ((cx - prev_coords[0]) ** 2 + (cy - prev_coords[1]) ** 2) ** 0.5
+            velocity = distance / self.frame_interval
+            if velocity > 0:
+                data.coords = (cx, cy)
+                data.velocity = velocity
+                data.last_seen = current_time
+
+                data.total_velocity += velocity
+                data.velocity_count += 1
+
+            if not data.visible and current_time - data.start_time >= self.min_visible_time:
+                data.visible = True
+
+            if data.visible:
+                visible.append((matched_id, (x, y, w, h)))
+        return visible
+
+    def sample(self, frame_count):
+        """Додає поточний стан об'єктів до tracked_data; повертає рядки для таблиці."""
+        rows = []
+        for obj_id, data in self.object_data.items():
+            x_pixel, y_pixel = data.coords
+            x_mm, y_mm = x_pixel * PIXEL_TO_MM, y_pixel * PIXEL_TO_MM
+
+            prev_x, prev_y = data.prev_coords or (x_pixel, y_pixel)
+            displacement = ((x_pixel - prev_x) ** 2 + (y_pixel - prev_y) ** 2) ** 0.5 * PIXEL_TO_MM
+            data.prev_coords = (x_pixel, y_pixel)
+
+            average_velocity = data.total_velocity / data.velocity_count if data.velocity_count > 0 else 0
+            if average_velocity == 0:
+                continue
+
+            rows.append((
+                obj_id, frame_count,
+                round(x_mm, 3), round(y_mm, 3),
+                round(displacement, 3), round(average_velocity, 3),
+                round(data.size_mm, 3)
+            ))
+        if self.tracked_data is not None:  # None - результати не накопичуються в пам'яті (живий потік)
+            self.tracked_data.append_rows([row[:-1] for row in rows])
+        return rows
+
+    def prune(self, current_time):
+        """Видаляє об'єкти, яких не було видно довше за max_disappear_time."""
+        for obj_id, data in list(self.object_data.items()):
+            if current_time - data.last_seen > self.max_disappear_time:
+                del self.object_data[obj_id]
+
+    def update(self, boxes, frame_number=None):
+        """Оновлює трекер рамками чергового кадру.
+
+        frame_number - номер кадру джерела для живих потоків, де частина кадрів відкидається:
+        час, швидкість і вибірка тоді рахуються за фактичним номером, а не за лічильником.
+        Повертає (visible, rows): видимі об'єкти кадру та рядки таблиці (порожні, якщо кадр не вибірковий).
+        """
+        previous = self.frame_count - self.frame_stride  # Номер попереднього аналізованого кадру
+        if frame_number is not None:
+            self.frame_interval = max(1, frame_number - previous) / self.fps
+            self.frame_count = frame_number
+        current_time = self.frame_count / self.fps
+        with self._measure("association"):
+            visible = self.track(boxes, current_time)
+
+        rows = []
+        # Вибірка - на першому аналізованому кадрі кожного інтервалу SAMPLE_EVERY (при frame_stride=1 - кожен 5-й)
+        if self.frame_count // SAMPLE_EVERY != previous // SAMPLE_EVERY:
+            with self._measure("output"):
+                rows = self.sample(self.frame_count)
+
+        self.prune(current_time)
+        self.frame_count += self.frame_stride
+        return visible, rows
+
+    def process_frame(self, frame, frame_number=None):
+        """Обробляє один кадр: виявлення та відстеження."""
+        return self.update(self.detect(frame), frame_number)
+
+    def replay(self, masks, offset=(0, 0), on_result=None):
+        """Відстеження за готовими масками переднього плану (наприклад, з кешу) - без декодування і MOG2."""
+        for fg_mask in masks:
+            frame_count = self.frame_count
+            visible, rows = self.update(self.boxes_from_mask(fg_mask, offset))
+            if on_result:
+                on_result(frame_count, visible, rows)
+        return self.tracked_data
+
+    def warm_up(self, cap, start, index=None, warmup=None):
+        """Готує обробку діапазону з кадру start: перехід за індексом і навчання MOG2 на попередніх кадрах.
+
+        Кадри розігріву (warmup, типово history) проходять лише MOG2 - без трекера й результатів.
+        Після виклику frame_count = start, тож номери кадрів і час у результатах абсолютні.
+        """
+        stride = self.frame_stride
+        warmup = int(self.settings["history"]) if warmup is None else warmup
+        count = min(start, warmup) // stride
+        seek(cap, start - count * stride, index)
+        for _ in range(count):
+            ret, frame = read_frame(cap, stride)
+            if not ret:
+                break
+            self.foreground(frame)
+        self.frame_count = start
+
+    def run(self, cap, stop_event=None):
+        """Обробляє всі кадри з відкритого cv2.VideoCapture якнайшвидше; повертає tracked_data."""
+        while cap.isOpened() and not (stop_event and stop_event.is_set()):
+            with self._measure("decode"):
+                ret, frame = read_frame(cap, self.frame_stride)
+            if not ret:
+                break
+            self.process_frame(frame)
+        return self.tracked_data
+
+
+def open_video(filepath):
+    """Відкриває відео; повертає (cap, fps) або піднімає IOError."""
+    cap = cv2.VideoCapture(filepath)
+    if not cap.isOpened():
+        raise IOError(f"Не вдалося відкрити відео: {filepath}")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if fps <= 0:
+        fps = 30
+    return cap, fps
+
+
+def load_index(filepath, store=False):
+    """Індекс кадрів відео: з бази (будується й зберігається при першому зверненні) або з файлу."""
+    if store:
+        from storage import frame_index, register_video  # БД потрібна лише в цьому режимі
+        return frame_index(register_video(filepath), filepath)
+    return build_index(filepath)
+
+
+def result_filename(filepath, output_dir=".", output_format="json", name=None):
+    """Ім'я файлу результатів у форматі <назва відео>_<час>.json (або .tracks для стовпчикового).
+
+    name замінює назву відео - для пакетної обробки, де в різних каталогах бувають однакові імена файлів.
+    """
+    video_name = name or filepath.split("/")[-1].split("\\")[-1].rsplit(".", 1)[0]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    suffix = COLUMNAR_SUFFIX if output_format == "columnar" else ".json"
+    return os.path.join(output_dir, f"{video_name}_{timestamp}{suffix}")
+
+
+def save_tracked_data(tracked_data, filename):
+    """Зберігає результати; формат визначається за розширенням (.json або .tracks); існуючий файл не замінюється."""
+    if os.path.exists(filename):  # Імена містять час до секунди - повторний запис не має тихо замінити результат
+        raise FileExistsError(f"Файл результатів уже існує: {filename}")
+    if filename.endswith(COLUMNAR_SUFFIX):
+        save_columnar(tracked_data, filename)
+        return
+    if isinstance(tracked_data, TrackStore):
+        tracked_data = tracked_data.to_dict()
+    with open(filename, "x", encoding="utf-8") as json_file:
+        json.dump(tracked_data, json_file, indent=4, ensure_ascii=False)
+
+
+def process_video(filepath, settings, output_dir=".", store=False, output_format="json",
+                  stats_interval=None, prometheus_path=None, cache=None, start=0, end=None, index=None,
+                  export_path=None, boxes_file=False, name=None):
+    """Обробляє відеофайл без GUI і зберігає результат; повертає статистику обробки.
+
+    store=True додатково записує результати в таблицю processed_videos (таблиці мають існувати).
+    stats_interval / prometheus_path вмикають періодичний звіт про продуктивність.
+    cache (maskcache.MaskCache): якщо маски для цього відео та параметрів MOG2 вже є в кеші,
+    декодування і MOG2 пропускаються; інакше маски записуються в кеш під час обробки.
+    start / end - діапазон кадрів [start, end) (end=None - до кінця); перехід виконується за індексом
+    кадрів index (frameindex.FrameIndex, за потреби будується). Кеш масок діє лише для всього відео.
+    export_path - паралельно записати відео з рамками (export.AnnotationExporter, окремий процес);
+    boxes_file=True - зберегти рамки у файл .boxes поруч із результатами для експорту пізніше.
+    name - назва файлу результатів замість назви відео (див. result_filename).
+    """
+    cap = cached = None
+    if start > 0 or end is not None:
+        cache = None
+    if cache is not None:
+        key = cache_key(filepath, settings)
+        cached = cache.get(key)
+    if cached is not None:
+        fps = cached.fps
+    else:
+        cap, fps = open_video(filepath)
+    processor = VideoProcessor(settings, fps, video_roi(settings, filepath), subtractor=cached is None)
+    if cache is not None and cached is None:
+        processor.mask_recorder = cache.writer(key, fps)
+    reporter = None
+    if stats_interval or prometheus_path:
+        processor.timer = StageTimer(source_fps=fps)
+        reporter = StatsReporter(processor.timer, stats_interval or 10.0, log=bool(stats_interval),
+                                 prometheus_path=prometheus_path).start()
+    writer = None
+    if store:
+        from storage import ResultWriter, register_video  # БД потрібна лише в цьому режимі
+        writer = ResultWriter(register_video(filepath, start=start, end=end), fps=fps)
+    if start > 0 and index is None:
+        index = load_index(filepath, store)
+    exporter = None
+    if export_path:
+        exporter = AnnotationExporter(filepath, export_path, fps, start, processor.frame_stride, index)
+    boxes = [] if boxes_file else None
+
+    def on_result(frame_count, visible, rows):
+        if rows and writer:
+            writer.add(rows)
+        if exporter:
+            exporter.add(frame_count, visible)
+        if boxes is not None:
+            boxes.append((frame_count, pack_boxes(visible)))
+
+    callback = on_result if writer or exporter or boxes is not None else None
+
+    start_time = time.perf_counter()
+    try:
+        if cached is not None:
+            tracked_data = processor.replay(cached, cached.offset, callback)
+        else:
+            frame_limit = None
+            if start > 0:
+                processor.warm_up(cap, start, index)
+            if end is not None:
+                frame_limit = max(0, -(-(end - start) // processor.frame_stride))
+            tracked_data = FramePipeline(cap, processor, on_result=callback, frame_limit=frame_limit).run()
+            if processor.mask_recorder:
+                processor.mask_recorder.commit(processor.roi_offset())
+        if writer:
+            writer.close()
+        elapsed_time = time.perf_counter() - start_time  # Лише аналіз, без очікування кодування
+    finally:
+        if cap is not None:
+            cap.release()
+        if processor.mask_recorder:
+            processor.mask_recorder.close()
+        if reporter:
+            reporter.stop()
+        if exporter:
+            exporter.close()  # Чекає, доки процес кодування допише відео
+
+    filename = result_filename(filepath, output_dir, output_format, name)
+    save_tracked_data(tracked_data, filename)
+    if boxes is not None:
+        save_boxes(os.path.splitext(filename)[0] + BOXES_SUFFIX, boxes, processor.frame_stride)
+    return {
+        "video": filepath,
+        "output": filename,
+        "frames": processor.frame_count - start,
+        "objects": len(tracked_data),
+        "elapsed_s": elapsed_time,
+        "fps": (processor.frame_count - start) / elapsed_time if elapsed_time > 0 else 0.0,
+        "cached": cached is not None,
+        "static_frames": processor.static_frames,
+        "export": export_path,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Обробка відео без графічного інтерфейсу")
+    parser.add_argument("video", help="Шлях до відеофайлу")
+    parser.add_argument("-o", "--output-dir", default=".", help="Каталог для JSON-результатів")
+    parser.add_argument("-s", "--settings", default=SETTINGS_FILE, help="Файл налаштувань")
+    parser.add_argument("--db", action="store_true", help="Зберегти результати також у базу даних")
+    parser.add_argument("--format", choices=("json", "columnar"), default="json", help="Формат файлу результатів")
+    parser.add_argument("--stats-interval", type=float, default=None,
+                        help="Друкувати статистику продуктивності кожні N секунд")
+    parser.add_argument("--prometheus", default=None, help="Файл для метрик у форматі Prometheus")
+    parser.add_argument("--cache", nargs="?", const=CACHE_DIR, default=None, metavar="DIR",
+                        help="Кеш масок переднього плану (повторний запуск зі зміненими min_contour_area "
+                             "чи параметрами трекера не декодує відео)")
+    parser.add_argument("--start", type=parse_position, default=None,
+                        help="Початок діапазону: номер кадру або час у секундах із суфіксом s (12.5s)")
+    parser.add_argument("--end", type=parse_position, default=None, help="Кінець діапазону (не включно)")
+    parser.add_argument("--export", default=None, metavar="MP4",
+                        help="Записати відео з рамками (кодується в окремому процесі паралельно з аналізом)")
+    parser.add_argument("--boxes", action="store_true",
+                        help="Зберегти рамки у файл .boxes поруч із результатами (для export.py без повторного аналізу)")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        from db import ensure_schema
+        ensure_schema()
+    os.makedirs(args.output_dir, exist_ok=True)
+    index = None
+    if any(isinstance(position, float) for position in (args.start, args.end)):
+        index = load_index(args.video, args.db)  # Час -> номер кадру за часом показу з індексу
+    start, end = (index.frame_at(position) if isinstance(position, float) else position
+                  for position in (args.start or 0, args.end))
+    stats = process_video(args.video, load_settings(args.settings), args.output_dir, args.db,
+                          args.format, args.stats_interval, args.prometheus,
+                          MaskCache(args.cache) if args.cache else None, start, end, index,
+                          args.export, args.boxes)
+    exported = f", {stats['export']}" if stats["export"] else ""
+    static = f", без руху пропущено {stats['static_frames']}" if stats["static_frames"] else ""
+    print(f"{stats['video']}: {stats['frames']} кадрів, {stats['objects']} об'єктів, "
+          f"{stats['elapsed_s']:.2f} с ({stats['fps']:.1f} кадр/с){' [кеш]' if stats['cached'] else ''}{static} "
+          f"-> {stats['output']}{exported}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import SETTINGS_FILE, load_settings, video_roi
+from frameindex import build_index, seek
+from processor import PIXEL_TO_MM, VideoProcessor, open_video, result_filename, save_tracked_data
+
+
+def split_segments(frame_total, segments, warmup):
+    """Ділить [0, frame_total) на відрізки; повертає [(warmup_start, start, end), ...].
+
+    Кадри [warmup_start, start) потрібні лише для навчання MOG2 і в результат не потрапляють.
+    """
+    bounds = [frame_total * i // segments for i in range(segments + 1)]
+    return [(max(0, start - warmup), start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def detect_segment(filepath, settings, warmup_start, start, end, index=None):
+    """Виявлення об'єктів на відрізку [start, end) з власним MOG2; повертає рамки по кадрах.
+
+    end=None - читати до кінця файлу. index (frameindex.FrameIndex) - для точного переходу до warmup_start.
+    """
+    cap, fps = open_video(filepath)
+    processor = VideoProcessor(settings, fps, video_roi(settings, filepath))
+    detections = []
+    try:
+        seek(cap, warmup_start, index)
+        frame_number = warmup_start
+        while end is None or frame_number < end:
+            if frame_number % processor.frame_stride:  # Кадри поза кроком frame_stride не аналізуються
+                if not cap.grab():
+                    break
+                frame_number += 1
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if frame_number >= start:
+                detections.append(processor.detect(frame))
+            else:
+                processor.foreground(frame)  # Розігрів: лише навчання MOG2, рамки не потрібні
+            frame_number += 1
+    finally:
+        cap.release()
+    return detections
+
+
+def process_video_segmented(filepath, settings, segments, warmup=None, workers=None):
+    """Паралельна обробка одного відео відрізками; повертає (tracked_data, номер кадру після останнього).
+
+    Дороге виявлення (MOG2, контури) виконується для відрізків у різних процесах, а зіставлення
+    об'єктів проходить по всіх кадрах послідовно в одному трекері. Так ID_n на межах відрізків
+    зшиваються автоматично, а tracked_data має той самий вигляд, що й при звичайній обробці.
+    Індекс кадрів будується до паралельної частини: для MP4 це лише розбір таблиць контейнера
+    (мілісекунди), а для інших контейнерів - повний прохід grab() по файлу.
+    """
+    cap, fps = open_video(filepath)
+    cap.release()
+    index = build_index(filepath)
+    frame_total = len(index)  # Кількість кадрів у заголовку контейнера буває неточною
+
+    if warmup is None:
+        warmup = int(settings["history"])
+    bounds = split_segments(frame_total, max(1, segments), warmup) or [(0, 0, None)]
+    bounds[-1] = bounds[-1][:2] + (None,)  # Останній відрізок - до фактичного кінця файлу
+
+    with ProcessPoolExecutor(max_workers=workers or len(bounds)) as executor:
+        futures = [executor.submit(detect_segment, filepath, settings, *segment, index) for segment in bounds]
+        processor = VideoProcessor(settings, fps, subtractor=False)  # Рамки вже знайдені у відрізках
+        for future in futures:
+            for boxes in future.result():
+                processor.update(boxes)
+    return processor.tracked_data, processor.frame_count
+
+
+def compare_tracks(expected, actual, tolerance_mm=PIXEL_TO_MM):
+    """Повертає ID об'єктів, які відрізняються між двома tracked_data.
+
+    Набір ID та кадри вибірки мають збігатися точно, координати - з точністю tolerance_mm
+    (типово 1 піксель; None - координати не порівнюються). MOG2 після короткого розігріву лише
+    наближається до стану послідовної обробки, тож рамки можуть відрізнятися на кілька пікселів.
+    """
+    mismatched = set(expected) ^ set(actual)
+    for obj_id in set(expected) & set(actual):
+        entries, other = expected[obj_id], actual[obj_id]
+        if [e["frame"] for e in entries] != [e["frame"] for e in other]:
+            mismatched.add(obj_id)
+            continue
+        if tolerance_mm is None:
+            continue
+        for e, o in zip(entries, other):
+            if abs(e["x_mm"] - o["x_mm"]) > tolerance_mm or abs(e["y_mm"] - o["y_mm"]) > tolerance_mm:
+                mismatched.add(obj_id)
+                break
+    return sorted(mismatched, key=lambda obj_id: int(obj_id.split("_")[1]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Паралельна обробка одного довгого відео відрізками")
+    parser.add_argument("video", help="Шлях до відеофайлу")
+    parser.add_argument("-n", "--segments", type=int, default=os.cpu_count() or 1, help="Кількість відрізків")
+    parser.add_argument("-w", "--warmup", type=int, default=None,
+                        help="Кадрів для навчання MOG2 перед відрізком (типово - history)")
+    parser.add_argument("-o", "--output-dir", default=".", help="Каталог для JSON-результатів")
+    parser.add_argument("-s", "--settings", default=SETTINGS_FILE, help="Файл налаштувань")
+    parser.add_argument("--format", choices=("json", "columnar"), default="json", help="Формат файлу результатів")
+    parser.add_argument("--verify", action="store_true", help="Порівняти результат з послідовною обробкою")
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.settings)
+    start_time = time.perf_counter()
+    tracked_data, frames = process_video_segmented(args.video, settings, args.segments, args.warmup)
+    elapsed = time.perf_counter() - start_time
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    filename = result_filename(args.video, args.output_dir, args.format)
+    save_tracked_data(tracked_data, filename)
+    print(f"{args.video}: {frames} кадрів, {len(tracked_data)} об'єктів, {elapsed:.2f} с "
+          f"({frames / elapsed if elapsed > 0 else 0:.1f} кадр/с) -> {filename}")
+
+    if args.verify:
+        cap, fps = open_video(args.video)
+        try:
+            serial_data = VideoProcessor(settings, fps, video_roi(settings, args.video)).run(cap)
+        finally:
+            cap.release()
+        mismatched = compare_tracks(serial_data, tracked_data)
+        if not mismatched:
+            print("Перевірка: результат збігається з послідовною обробкою.")
+        else:
+            print(f"Перевірка: розбіжності для {len(mismatched)} об'єктів: {', '.join(mismatched[:10])}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
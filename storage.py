@@ -0,0 +1,276 @@
+import os
+import time
+from datetime import datetime
+
+import cv2
+from sqlalchemy import delete, func, case, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db import engine, ensure_schema, session_scope
+from frameindex import build_index, FrameIndex
+from models import Video, ProcessedVideo, TrackSummary, VideoIndex
+
+
+def _file_identity(filepath):
+    """(шлях, розмір у мегабайтах, назва) - за ними знаходяться записи Video файлу."""
+    filename = os.path.abspath(filepath)
+    file_size = round(os.path.getsize(filepath) / (1024 * 1024), 3)  # Розмір у мегабайтах
+    return filename, file_size, os.path.splitext(os.path.basename(filepath))[0]
+
+
+def register_video(filepath, user_id=None, start=0, end=None):
+    """Створює (або знаходить уже зареєстрований) запис Video для файлу; повертає його id.
+
+    Діапазон кадрів [start, end) отримує окремий запис: ID об'єктів у ньому нумеруються заново,
+    тож його результати не змішуються з результатами всього відео й не замінюють їх.
+    """
+    filename, file_size, title = _file_identity(filepath)
+    if start or end is not None:
+        title += f" [{start}:{'' if end is None else end}]"
+
+    ensure_schema()
+    with session_scope() as session:
+        video = session.query(Video).filter(
+            Video.filename == filename, Video.file_size == file_size, Video.title == title).first()
+        if video is None:
+            cap = cv2.VideoCapture(filepath)
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            cap.release()
+
+            video = Video(
+                title=title,
+                filename=filename,
+                file_size=file_size,
+                resolution=f"{width}x{height}" if width and height else None,
+                duration=frames / fps if fps > 0 and frames > 0 else None,
+                user_id=user_id
+            )
+            session.add(video)
+            session.flush()
+        return video.id
+
+
+def register_stream(source, resolution=None, user_id=None):
+    """Створює запис Video для сеансу живого джерела (камера, RTSP); повертає його id.
+
+    Кожен сеанс - окремий запис: номери кадрів та ID об'єктів починаються заново.
+    """
+    ensure_schema()
+    with session_scope() as session:
+        video = Video(
+            title=f"{source} {datetime.now():%Y-%m-%d %H:%M:%S}",
+            filename=str(source),
+            file_size=0.0,
+            resolution=resolution,
+            user_id=user_id
+        )
+        session.add(video)
+        session.flush()
+        return video.id
+
+
+class ResultWriter:
+    """Буферизований запис результатів у processed_videos.
+
+    Рядки накопичуються в пам'яті й записуються пакетами через executemany в одній
+    транзакції на пакет - без створення ORM-об'єкта на кожне виявлення.
+    flush_interval (с) додатково скидає буфер за часом - для живих потоків, що працюють безперервно.
+    fps потрібен для швидкості між вибірками (max_velocity у track_summaries).
+    """
+
+    def __init__(self, video_id, batch_size=10000, replace=True, flush_interval=None, fps=30):
+        self.video_id = video_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fps = fps
+        self._last_frames = {}  # object_id -> кадр попереднього записаного рядка (між пакетами)
+        self._last_flush = time.monotonic()
+        self.buffer = []
+        self.rows_written = 0
+        if replace:  # Повторна обробка відео замінює попередні результати
+            with engine.begin() as conn:
+                conn.execute(delete(ProcessedVideo).where(ProcessedVideo.video_id == video_id))
+                conn.execute(delete(TrackSummary).where(TrackSummary.video_id == video_id))
+
+    def add(self, rows):
+        """Додає рядки таблиці у форматі VideoProcessor.sample()."""
+        for obj_id, frame_count, x_mm, y_mm, displacement, velocity, _size_mm in rows:
+            self.buffer.append({
+                "video_id": self.video_id,
+                "object_id": obj_id,
+                "frame_number": frame_count,
+                "x_position": x_mm,
+                "y_position": y_mm,
+                "displacement": displacement,
+                "velocity": velocity,
+            })
+        if len(self.buffer) >= self.batch_size or (
+                self.flush_interval and time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        with engine.begin() as conn:
+            conn.execute(ProcessedVideo.__table__.insert(), self.buffer)
+            _write_summaries(conn, _summarize(self.buffer, self.fps, self._last_frames))
+        self.rows_written += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _summarize(rows, fps, last_frames):
+    """Підсумки пакета рядків по кожному об'єкту (рядки йдуть у порядку кадрів).
+
+    velocity у рядку - середня від початку треку, тому max_velocity рахується за швидкістю між
+    сусідніми вибірками: displacement / (різниця кадрів / fps). last_frames ({object_id: кадр})
+    зберігає попередній кадр об'єкта між пакетами й оновлюється на місці.
+    """
+    summaries = {}
+    for row in rows:
+        obj_id, frame = row["object_id"], row["frame_number"]
+        previous = last_frames.get(obj_id)
+        last_frames[obj_id] = frame
+        speed = row["displacement"] * fps / (frame - previous) if previous is not None and frame > previous else 0.0
+        summary = summaries.get(obj_id)
+        if summary is None:
+            summaries[obj_id] = {
+                "video_id": row["video_id"],
+                "object_id": obj_id,
+                "first_frame": frame,
+                "last_frame": frame,
+                "samples": 1,
+                "path_length": row["displacement"],
+                "mean_velocity": row["velocity"],
+                "max_velocity": speed,
+                "min_x": row["x_position"], "max_x": row["x_position"],
+                "min_y": row["y_position"], "max_y": row["y_position"],
+            }
+            continue
+        summary["last_frame"] = frame
+        summary["samples"] += 1
+        summary["path_length"] += row["displacement"]
+        summary["mean_velocity"] = row["velocity"]  # velocity у рядку - вже середня від початку треку
+        summary["max_velocity"] = max(summary["max_velocity"], speed)
+        summary["min_x"] = min(summary["min_x"], row["x_position"])
+        summary["max_x"] = max(summary["max_x"], row["x_position"])
+        summary["min_y"] = min(summary["min_y"], row["y_position"])
+        summary["max_y"] = max(summary["max_y"], row["y_position"])
+    return list(summaries.values())
+
+
+def _write_summaries(conn, summaries):
+    """Зливає підсумки пакета з уже записаними: INSERT ... ON CONFLICT для SQLite і PostgreSQL,
+    для інших діалектів - _merge_summaries()."""
+    if conn.dialect.name in ("sqlite", "postgresql"):
+        conn.execute(_summary_upsert(conn.dialect.name), summaries)
+    else:
+        _merge_summaries(conn, summaries)
+
+
+def _merge_summaries(conn, summaries):
+    """Переносне злиття: читання рядка з блокуванням (SELECT ... FOR UPDATE), далі UPDATE або INSERT
+    у транзакції conn - по запиту на об'єкт, тож повільніше за ON CONFLICT."""
+    table = TrackSummary.__table__
+    for summary in summaries:
+        key = (table.c.video_id == summary["video_id"]) & (table.c.object_id == summary["object_id"])
+        old = conn.execute(select(table).where(key).with_for_update()).mappings().first()
+        if old is None:
+            conn.execute(table.insert(), summary)
+        else:
+            conn.execute(table.update().where(key).values(_merge_summary(old, summary)))
+
+
+def _merge_summary(old, new):
+    """Те саме злиття, що й у _summary_upsert(), для рядків-словників."""
+    return {
+        "first_frame": min(old["first_frame"], new["first_frame"]),
+        "last_frame": max(old["last_frame"], new["last_frame"]),
+        "samples": old["samples"] + new["samples"],
+        "path_length": old["path_length"] + new["path_length"],
+        "mean_velocity": new["mean_velocity"] if new["last_frame"] >= old["last_frame"] else old["mean_velocity"],
+        "max_velocity": max(old["max_velocity"], new["max_velocity"]),
+        "min_x": min(old["min_x"], new["min_x"]),
+        "max_x": max(old["max_x"], new["max_x"]),
+        "min_y": min(old["min_y"], new["min_y"]),
+        "max_y": max(old["max_y"], new["max_y"]),
+    }
+
+
+def _summary_upsert(dialect):
+    """INSERT ... ON CONFLICT, що зливає підсумки пакета з уже записаними (SQLite або PostgreSQL)."""
+    if dialect == "sqlite":
+        insert, least, greatest = sqlite_insert, func.min, func.max  # Скалярні min/max з двома аргументами
+    else:
+        from sqlalchemy.dialects.postgresql import insert  # Діалект імпортується лише для PostgreSQL
+        least, greatest = func.least, func.greatest
+    stmt = insert(TrackSummary)
+    new, old = stmt.excluded, TrackSummary.__table__.c
+    return stmt.on_conflict_do_update(
+        index_elements=[old.video_id, old.object_id],
+        set_={
+            "first_frame": least(old.first_frame, new.first_frame),
+            "last_frame": greatest(old.last_frame, new.last_frame),
+            "samples": old.samples + new.samples,
+            "path_length": old.path_length + new.path_length,
+            "mean_velocity": case((new.last_frame >= old.last_frame, new.mean_velocity), else_=old.mean_velocity),
+            "max_velocity": greatest(old.max_velocity, new.max_velocity),
+            "min_x": least(old.min_x, new.min_x),
+            "max_x": greatest(old.max_x, new.max_x),
+            "min_y": least(old.min_y, new.min_y),
+            "max_y": greatest(old.max_y, new.max_y),
+        }
+    )
+
+
+def fastest_objects(video_id, limit=10):
+    """Найшвидші об'єкти відео за підсумковою таблицею (без сканування processed_videos)."""
+    with engine.connect() as conn:
+        return conn.execute(
+            select(TrackSummary)
+            .where(TrackSummary.video_id == video_id)
+            .order_by(TrackSummary.max_velocity.desc())
+            .limit(limit)
+        ).all()
+
+
+def frame_index(video_id, filepath):
+    """Індекс кадрів відео з бази; будується й зберігається поруч із записом Video при першому зверненні."""
+    with session_scope() as session:
+        record = session.get(VideoIndex, video_id)
+        if record is not None:
+            return FrameIndex.from_bytes(record.data, record.source)
+    index = build_index(filepath)
+    with session_scope() as session:
+        session.merge(VideoIndex(video_id=video_id, source=index.source, frame_count=len(index),
+                                 keyframe_count=len(index.keyframes), data=index.to_bytes()))
+    return index
+
+
+def find_object(filepath, obj_id):
+    """(перший, останній) кадр об'єкта в результатах файлу або None; записи Video не створюються.
+
+    Шукає спершу в результатах усього відео, далі в діапазонах кадрів (новіші записи першими).
+    """
+    filename, file_size, title = _file_identity(filepath)
+    ensure_schema()
+    with engine.connect() as conn:
+        row = conn.execute(
+            select(TrackSummary.first_frame, TrackSummary.last_frame)
+            .join(Video, Video.id == TrackSummary.video_id)
+            .where(Video.filename == filename, Video.file_size == file_size, TrackSummary.object_id == obj_id)
+            .order_by(case((Video.title == title, 0), else_=1), Video.id.desc())
+        ).first()
+    return tuple(row) if row else None
@@ -0,0 +1,260 @@
+"""Живі джерела: камери (номер пристрою) та мережеві потоки (RTSP, HTTP).
+
+Безперервний моніторинг без GUI:
+    python stream.py rtsp://camera/stream --db
+    python stream.py 0 --duration 3600
+    python stream.py video.mp4 --simulate --loop   # файл як замінник камери для перевірки
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import cv2
+
+from config import SETTINGS_FILE, load_settings, video_roi
+from metrics import StageTimer, StatsReporter
+from pipeline import FramePipeline
+from processor import VideoProcessor
+
+STREAM_SCHEMES = ("rtsp://", "rtsps://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+DEFAULT_STREAM_FPS = 25  # Якщо джерело не повідомляє FPS (типово для RTSP і веб-камер)
+READ_TIMEOUT = 5.0  # с без нового кадру - джерело вважається втраченим
+FLUSH_INTERVAL = 5.0  # с між скиданнями результатів на диск / в БД
+
+
+def is_stream_source(source):
+    """True для номера пристрою ("0") або URL мережевого потоку."""
+    source = str(source).strip()
+    return source.isdigit() or source.lower().startswith(STREAM_SCHEMES)
+
+
+class LatestFrameGrabber:
+    """Читає джерело на окремому потоці й тримає лише найновіший кадр.
+
+    read() віддає найсвіжіший ще не виданий кадр, тож якщо обробка повільніша за камеру,
+    старі кадри відкидаються, а не накопичуються в черзі - затримка лишається обмеженою.
+    frame_number - номер виданого кадру в джерелі (для обчислення часу в трекері).
+    Має інтерфейс cv2.VideoCapture, достатній для FramePipeline.
+
+    simulate_fps - для файлу-замінника камери: кадри надходять з цією частотою, а не якнайшвидше;
+    loop=True - після кінця файлу читання починається спочатку.
+    """
+
+    def __init__(self, cap, simulate_fps=None, loop=False, read_timeout=READ_TIMEOUT):
+        self.cap = cap
+        self.simulate_fps = simulate_fps
+        self.loop = loop
+        self.read_timeout = read_timeout
+        self.frame_number = -1
+        self.grabbed_frames = 0
+        self.dropped_frames = 0  # Кадри, які перезаписав новіший до того, як їх забрали
+        self._frame = None
+        self._latest_number = -1
+        self._ended = False
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        next_time = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    if self.loop and self.grabbed_frames and self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+                        continue
+                    break
+                with self._condition:
+                    if self._latest_number > self.frame_number:
+                        self.dropped_frames += 1
+                    self._frame = frame
+                    self._latest_number = self.grabbed_frames
+                    self.grabbed_frames += 1
+                    self._condition.notify_all()
+
+                if self.simulate_fps:
+                    next_time = max(next_time + 1 / self.simulate_fps, time.perf_counter() - 1)
+                    self._stop_event.wait(max(0.0, next_time - time.perf_counter()))
+        finally:
+            with self._condition:
+                self._ended = True
+                self._condition.notify_all()
+
+    def read_numbered(self):
+        """(ret, кадр, номер кадру в джерелі) - номер береться разом із кадром під тим самим блокуванням."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._latest_number > self.frame_number or self._ended,
+                                     timeout=self.read_timeout)
+            if self._latest_number <= self.frame_number:  # Джерело завершилось або замовкло
+                return False, None, None
+            self.frame_number = self._latest_number
+            return True, self._frame, self.frame_number
+
+    def read(self):
+        return self.read_numbered()[:2]
+
+    def grab(self):
+        return self.read()[0]
+
+    def isOpened(self):
+        return self.cap.isOpened() and not (self._ended and self._latest_number <= self.frame_number)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self._stop_event.set()
+        self._thread.join(timeout=self.read_timeout)
+        self.cap.release()
+
+
+def open_stream(source, simulate=False, loop=False):
+    """Відкриває живе джерело; повертає (LatestFrameGrabber, fps) або піднімає IOError.
+
+    simulate=True відтворює відеофайл у реальному часі як замінник камери.
+    """
+    source = str(source).strip()
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    if not cap.isOpened():
+        raise IOError(f"Не вдалося відкрити джерело: {source}")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if not fps or fps <= 0 or fps > 240:  # Деякі камери повертають 0 або нереальні значення
+        fps = DEFAULT_STREAM_FPS
+    return LatestFrameGrabber(cap, fps if simulate else None, loop), fps
+
+
+class RowLogWriter:
+    """Дописує рядки результатів у файл JSON Lines і скидає його на диск кожні flush_interval секунд."""
+
+    def __init__(self, filename, flush_interval=FLUSH_INTERVAL):
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self._file = open(filename, "a", encoding="utf-8")
+        self._last_flush = time.monotonic()
+
+    def add(self, rows):
+        for obj_id, frame_count, x_mm, y_mm, displacement, velocity, size_mm in rows:
+            self._file.write(json.dumps({
+                "object_id": obj_id, "frame": frame_count, "time": round(time.time(), 3),
+                "x_mm": x_mm, "y_mm": y_mm, "displacement_mm": displacement,
+                "average_velocity_mm_s": velocity, "size_mm": size_mm,
+            }, ensure_ascii=False) + "\n")
+        self.rows_written += len(rows)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self._file.close()
+
+
+def monitor(source, settings, output_dir=".", store=False, simulate=False, loop=False, duration=None,
+            flush_interval=FLUSH_INTERVAL, stats_interval=None, prometheus_path=None, stop_event=None):
+    """Безперервна обробка живого джерела до зупинки, кінця потоку або duration секунд.
+
+    Результати не накопичуються в пам'яті, а дописуються у файл .jsonl (і в БД при store=True)
+    кожні flush_interval секунд. Повертає статистику сеансу.
+    """
+    source = str(source).strip()
+    grabber, fps = open_stream(source, simulate, loop)
+    stop_event = stop_event or threading.Event()
+    processor = VideoProcessor(settings, fps, video_roi(settings, source))
+    processor.tracked_data = None
+    processor.timer = StageTimer(source_fps=fps)
+    reporter = None
+    if stats_interval or prometheus_path:
+        reporter = StatsReporter(processor.timer, stats_interval or 10.0, log=bool(stats_interval),
+                                 prometheus_path=prometheus_path).start()
+
+    if source.isdigit():
+        name = f"camera{source}"
+    else:
+        name = os.path.splitext(os.path.basename(source.rstrip("/")))[0] or "stream"
+    log = RowLogWriter(os.path.join(output_dir, f"{name}_{datetime.now():%Y%m%d_%H%M%S}.jsonl"), flush_interval)
+    writer = None
+    if store:
+        from storage import ResultWriter, register_stream  # БД потрібна лише в цьому режимі
+        resolution = f"{int(grabber.get(cv2.CAP_PROP_FRAME_WIDTH))}x{int(grabber.get(cv2.CAP_PROP_FRAME_HEIGHT))}"
+        writer = ResultWriter(register_stream(source, resolution), replace=False, flush_interval=flush_interval,
+                              fps=fps)
+
+    def on_result(frame_count, visible, rows):
+        if rows:
+            log.add(rows)
+            if writer:
+                writer.add(rows)
+
+    timer = threading.Timer(duration, stop_event.set) if duration else None
+    if timer:
+        timer.daemon = True
+        timer.start()
+    start_time = time.perf_counter()
+    try:
+        FramePipeline(grabber, processor, on_result=on_result, stop_event=stop_event, live=True).run()
+    finally:
+        if timer:
+            timer.cancel()
+        grabber.release()
+        log.close()
+        if writer:
+            writer.close()
+        if reporter:
+            reporter.stop()
+    elapsed_time = time.perf_counter() - start_time
+    processed = processor.timer.counts.get("latency", 0)
+    return {
+        "source": source,
+        "output": log.filename,
+        "rows": log.rows_written,
+        "source_frames": grabber.grabbed_frames,
+        "processed_frames": processed,
+        "dropped_frames": grabber.dropped_frames,
+        "elapsed_s": elapsed_time,
+        "latency_p95_ms": processor.timer.snapshot()["stages"].get("latency", {}).get("p95_ms"),
+        "ended": not stop_event.is_set(),  # True - джерело завершилось або перестало надсилати кадри
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Безперервна обробка камери або мережевого потоку")
+    parser.add_argument("source", help="Номер камери (0, 1, ...), URL потоку або файл (з --simulate)")
+    parser.add_argument("-o", "--output-dir", default=".", help="Каталог для файлів .jsonl")
+    parser.add_argument("-s", "--settings", default=SETTINGS_FILE, help="Файл налаштувань")
+    parser.add_argument("--db", action="store_true", help="Записувати результати також у базу даних")
+    parser.add_argument("--simulate", action="store_true", help="Відтворювати файл у реальному часі як камеру")
+    parser.add_argument("--loop", action="store_true", help="Повторювати файл з початку (з --simulate)")
+    parser.add_argument("--duration", type=float, default=None, help="Зупинитися через N секунд")
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL, help="Скидати результати кожні N секунд")
+    parser.add_argument("--stats-interval", type=float, default=None,
+                        help="Друкувати статистику продуктивності кожні N секунд")
+    parser.add_argument("--prometheus", default=None, help="Файл для метрик у форматі Prometheus")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        from db import ensure_schema
+        ensure_schema()
+    os.makedirs(args.output_dir, exist_ok=True)
+    stop_event = threading.Event()
+    try:
+        stats = monitor(args.source, load_settings(args.settings), args.output_dir, args.db, args.simulate,
+                        args.loop, args.duration, args.flush_interval, args.stats_interval, args.prometheus,
+                        stop_event)
+    except KeyboardInterrupt:
+        print("Зупинено")
+        return
+    latency = f"{stats['latency_p95_ms']:.0f} мс" if stats["latency_p95_ms"] is not None else "-"
+    print(f"{stats['source']}: {stats['processed_frames']} з {stats['source_frames']} кадрів оброблено "
+          f"(відкинуто {stats['dropped_frames']}), затримка p95 {latency}, {stats['rows']} рядків "
+          f"за {stats['elapsed_s']:.0f} с{' - джерело завершилось' if stats['ended'] else ''} -> {stats['output']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Перебір сітки налаштувань за один прохід декодування.
+
+Кожен кадр декодується один раз і передається всім конфігураціям. Конфігурації з однаковими
+параметрами маски (history, varThreshold, processing_scale) ділять один MOG2, а min_contour_area
+та параметри трекера перебираються вже на готовій масці. При motion_threshold > 0 пропуск кадру
+залежить і від min_contour_area, тож такі конфігурації діляться на групи й за ним (maskcache.mask_params).
+
+    python sweep.py video.mp4 -p history=200,500 -p varThreshold=16,25 -p min_contour_area=500,1000
+"""
+import argparse
+import itertools
+import json
+import queue
+import threading
+import time
+
+import numpy as np
+
+from config import SETTINGS_FILE, load_settings, video_roi
+from maskcache import mask_params
+from pipeline import read_frame
+from processor import VideoProcessor, open_video
+
+DEFAULT_GRID = {
+    "history": [200, 500],
+    "varThreshold": [16, 25],
+    "min_contour_area": [500, 1000],
+}
+_END = object()
+
+
+def expand_grid(settings, grid):
+    """Список налаштувань для кожної комбінації значень grid ({ключ: [значення, ...]})."""
+    keys = list(grid)
+    return [dict(settings, **dict(zip(keys, values))) for values in itertools.product(*grid.values())]
+
+
+def parse_param(text):
+    """'key=v1,v2' -> (key, [v1, v2]); значення розбираються як JSON (числа, рядки без лапок - як є)."""
+    key, _, values = text.partition("=")
+    if not key or not values:
+        raise argparse.ArgumentTypeError(f"Очікується KEY=V1,V2,...: {text}")
+    parsed = []
+    for value in values.split(","):
+        try:
+            parsed.append(json.loads(value))
+        except json.JSONDecodeError:
+            parsed.append(value)
+    return key, parsed
+
+
+class _MaskGroup:
+    """Один MOG2 та всі трекери, що використовують його маску; працює навласному потоці.
+
+    З воротами руху (motion_threshold > 0) рамки дає detect() детектора - з тим самим пропуском
+    статичних кадрів, що й у звичайній обробці; min_contour_area у всіх конфігурацій групи однакова.
+    """
+
+    def __init__(self, configs, fps, roi, queue_size):
+        self.detector = VideoProcessor(configs[0], fps, roi)
+        self.trackers = [VideoProcessor(config, fps, roi, subtractor=False) for config in configs]
+        self.mask_time = 0.0
+        self.track_times = [0.0] * len(configs)
+        self.error = None
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _process(self, frame):
+        start = time.perf_counter()
+        if self.detector.motion_gate is not None:
+            boxes = self.detector.detect(frame)
+        else:
+            fg_mask = self.detector.foreground(frame)
+            offset = self.detector.roi_offset()
+        self.mask_time += time.perf_counter() - start
+        for i, tracker in enumerate(self.trackers):
+            start = time.perf_counter()
+            if self.detector.motion_gate is not None:
+                tracker.update(boxes)
+            else:
+                tracker.update(tracker.boxes_from_mask(fg_mask, offset))
+            self.track_times[i] += time.perf_counter() - start
+
+    def _run(self):
+        # Після помилки кадри лише вичитуються, щоб декодер не заблокувався на повній черзі
+        while True:
+            frame = self.frames.get()
+            if frame is _END:
+                return
+            if self.error is None:
+                try:
+                    self._process(frame)
+                except Exception as e:
+                    self.error = e
+
+
+def track_stats(tracked_data, fps):
+    """(кількість треків, середня тривалість треку в секундах, середня кількість вибірок на трек)."""
+    frame, _, _, objects = tracked_data.columns()
+    if not objects:
+        return 0, 0.0, 0.0
+    bounds = np.array(list(objects.values()))
+    durations = (frame[bounds[:, 1] - 1] - frame[bounds[:, 0]]) / fps
+    return len(objects), float(durations.mean()), float((bounds[:, 1] - bounds[:, 0]).mean())
+
+
+def run_sweep(filepath, configs, queue_size=8):
+    """Обробляє відео всіма конфігураціями за одне декодування; повертає (результати, статистика проходу).
+
+    Групи MOG2 працюють на окремих потоках (OpenCV відпускає GIL), кадр між ними не копіюється.
+    """
+    strides = {max(1, int(config.get("frame_stride", 1))) for config in configs}
+    if len(strides) != 1:
+        raise ValueError("frame_stride має бути однаковим для всіх конфігурацій одного проходу")
+    stride = strides.pop()
+
+    cap, fps = open_video(filepath)
+    groups = {}
+    for index, config in enumerate(configs):
+        key = json.dumps(mask_params(config, filepath), sort_keys=True)
+        groups.setdefault(key, []).append(index)
+    workers = [(_MaskGroup([configs[i] for i in indices], fps, video_roi(configs[indices[0]], filepath),
+                           queue_size), indices) for indices in groups.values()]
+
+    frames = 0
+    decode_time = 0.0
+    start_time = time.perf_counter()
+    for group, _ in workers:
+        group.thread.start()
+    try:
+        while cap.isOpened():
+            decode_start = time.perf_counter()
+            ret, frame = read_frame(cap, stride)
+            decode_time += time.perf_counter() - decode_start
+            if not ret:
+                break
+            frames += 1
+            for group, _ in workers:
+                group.frames.put(frame)
+    finally:
+        cap.release()
+        for group, _ in workers:
+            group.frames.put(_END)
+        for group, _ in workers:
+            group.thread.join()
+    elapsed = time.perf_counter() - start_time
+    for group, _ in workers:
+        if group.error is not None:
+            raise group.error
+
+    results = [None] * len(configs)
+    for group, indices in workers:
+        for tracker, track_time, index in zip(group.trackers, group.track_times, indices):
+            tracks, mean_duration, mean_samples = track_stats(tracker.tracked_data, fps)
+            results[index] = {
+                "settings": configs[index],
+                "tracks": tracks,
+                "mean_track_s": mean_duration,
+                "mean_samples": mean_samples,
+                "mask_s": group.mask_time,  # Спільний для всіх конфігурацій групи
+                "track_s": track_time,
+                "shared_mask_with": len(indices),
+            }
+    return results, {"frames": frames, "decode_s": decode_time, "elapsed_s": elapsed, "mask_groups": len(workers)}
+
+
+def print_table(results, keys, run_stats):
+    header = "".join(f"{key:>18}" for key in keys)
+    print(f"{header} {'треків':>7} {'сер. трек, с':>13} {'вибірок':>8} {'маска, с':>9} {'трекер, с':>10}")
+    for result in results:
+        values = "".join(f"{str(result['settings'][key]):>18}" for key in keys)
+        mask = f"{result['mask_s']:.2f}" + ("*" if result["shared_mask_with"] > 1 else "")
+        print(f"{values} {result['tracks']:>7} {result['mean_track_s']:>13.2f} {result['mean_samples']:>8.1f} "
+              f"{mask:>9} {result['track_s']:>10.2f}")
+    print(f"\n* маска спільна для конфігурацій з однаковими параметрами MOG2 ({run_stats['mask_groups']} груп)")
+    print(f"{run_stats['frames']} кадрів, {len(results)} конфігурацій: декодування {run_stats['decode_s']:.2f} с "
+          f"(один раз), загалом {run_stats['elapsed_s']:.2f} с; окремі прогони лише на декодування "
+          f"витратили б ~{run_stats['decode_s'] * len(results):.2f} с")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перебір налаштувань за одне декодування відео")
+    parser.add_argument("video", help="Шлях до відеофайлу")
+    parser.add_argument("-p", "--param", type=parse_param, action="append", metavar="KEY=V1,V2",
+                        help="Значення параметра для перебору (можна повторювати); "
+                             "типово - history, varThreshold і min_contour_area")
+    parser.add_argument("-s", "--settings", default=SETTINGS_FILE, help="Базовий файл налаштувань")
+    parser.add_argument("--json", help="Зберегти результати у JSON-файл")
+    args = parser.parse_args(argv)
+
+    grid = dict(args.param) if args.param else DEFAULT_GRID
+    configs = expand_grid(load_settings(args.settings), grid)
+    results, run_stats = run_sweep(args.video, configs)
+    print_table(results, list(grid), run_stats)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"video": args.video, "grid": grid, **run_stats, "results": results}, f,
+                      indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
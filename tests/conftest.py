@@ -0,0 +1,133 @@
+import cv2
+import numpy as np
+import pytest
+
+
+def write_stop_and_go(path, frames=180, size=(320, 240), fps=30):
+    """Відео з квадратом 40x40: 40 кадрів порожнього фону, рух, зупинка на 60 кадрів, знову рух."""
+    rng = np.random.default_rng(0)
+    background = rng.integers(40, 80, size=(size[1], size[0], 3), dtype=np.uint8)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    x = 20
+    for frame_number in range(frames):
+        frame = background.copy()
+        if 40 <= frame_number < 80 or frame_number >= 140:
+            x += 3
+        if frame_number >= 40:
+            cv2.rectangle(frame, (x, 100), (x + 39, 139), (220, 220, 220), -1)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+@pytest.fixture(scope="session")
+def stop_and_go_clip(tmp_path_factory):
+    return write_stop_and_go(str(tmp_path_factory.mktemp("clips") / "stop_and_go.mp4"))
+
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    """База SQLite в пам'яті замість database.db для storage і session_scope."""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy.orm import sessionmaker
+
+    import db
+    import storage
+    from models import Base
+
+    engine = db.make_engine("sqlite://")
+    monkeypatch.setattr(storage, "engine", engine)
+    monkeypatch.setattr(db, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(db, "_schema_checked", True)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+TRACK_ROWS = [  # (obj_id, frame, x_mm, y_mm, displacement_mm, average_velocity_mm_s), об'єкти чергуються
+    ("ID_0", 0, 1.5, 2.25, 0.0, 0.0),
+    ("ID_1", 0, 10.0, 20.0, 0.0, 0.0),
+    ("ID_0", 5, 2.5, 2.25, 1.0, 6.0),
+    ("ID_2", 5, 7.125, 8.0, 0.0, 0.0),
+    ("ID_0", 10, 4.5, 3.0, 2.125, 9.0),
+    ("ID_1", 10, 12.0, 21.5, 2.5, 15.0),
+]
+
+
+@pytest.fixture
+def track_rows():
+    return list(TRACK_ROWS)
+
+
+@pytest.fixture
+def tracked_dict():
+    """TRACK_ROWS у звичній структурі tracked_data."""
+    from tracks import FIELDS
+
+    tracked_data = {}
+    for obj_id, *values in TRACK_ROWS:
+        tracked_data.setdefault(obj_id, []).append(dict(zip(FIELDS, values)))
+    return tracked_data
+
+
+@pytest.fixture
+def track_store():
+    """TRACK_ROWS у TrackStore з малою місткістю - сховище кілька разів розширюється."""
+    from tracks import TrackStore
+
+    store = TrackStore(capacity=2)
+    for row in TRACK_ROWS:
+        store.append_rows([row])
+    return store
+
+
+class NumberedCapture:
+    """Замінник cv2.VideoCapture: кадр 1x1, значення пікселя - номер кадру."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.position = 0
+
+    def read(self):
+        if self.position >= self.frames:
+            return False, None
+        frame = np.full((1, 1), self.position, dtype=np.int32)
+        self.position += 1
+        return True, frame
+
+    def grab(self):
+        return self.read()[0]
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return 0
+
+    def release(self):
+        pass
+
+
+class RecordingProcessor:
+    """Замість VideoProcessor у FramePipeline: записує пари (номер у пікселі, номер кадру від конвеєра)."""
+
+    def __init__(self, frame_stride=1):
+        self.frame_stride = frame_stride
+        self.frame_count = 0
+        self.timer = None
+        self.tracked_data = None
+        self.seen = []
+
+    def process_frame(self, frame, frame_number=None):
+        self.seen.append((int(frame[0, 0]), frame_number))
+        self.frame_count = (self.frame_count if frame_number is None else frame_number) + self.frame_stride
+        return [], []
+
+
+@pytest.fixture
+def numbered_capture():
+    return NumberedCapture
+
+
+@pytest.fixture
+def recording_processor():
+    return RecordingProcessor
@@ -0,0 +1,20 @@
+import pytest
+
+import association
+from association import associate, resolve_method
+
+
+def test_greedy_matches_nearest_within_gate():
+    assert associate([(0, 0), (100, 100)], [(102, 101), (1, 1)], gate=10) == {0: 1, 1: 0}
+    assert associate([(0, 0)], [(50, 50)], gate=10) == {}
+
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        resolve_method("nearest")
+
+
+def test_hungarian_without_scipy_warns(monkeypatch):
+    monkeypatch.setattr(association, "linear_sum_assignment", None)
+    with pytest.warns(RuntimeWarning, match="scipy"):
+        assert resolve_method("hungarian") == "greedy"
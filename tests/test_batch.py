@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from batch import result_names
+from processor import save_tracked_data
+
+
+def test_result_names_keep_plain_stems():
+    assert result_names(["data/a.mp4", "data/b.avi"]) == ["a", "b"]
+
+
+def test_result_names_disambiguate_same_stem():
+    names = result_names([os.path.join("v2", "day1", "cam.mp4"), os.path.join("v2", "day2", "cam.mp4"),
+                          os.path.join("v2", "day2", "cam.avi")])
+    assert names == ["day1_cam_mp4", "day2_cam_mp4", "day2_cam_avi"]
+
+
+def test_result_names_reject_collisions():
+    with pytest.raises(ValueError):
+        result_names(["d1/cam.mp4", "d2/cam.mp4", "d1_cam_mp4.avi"])
+
+
+def test_save_tracked_data_does_not_overwrite(tmp_path):
+    filename = str(tmp_path / "result.json")
+    save_tracked_data({}, filename)
+    with pytest.raises(FileExistsError):
+        save_tracked_data({}, filename)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from columnar import TrackReader, load_tracked_data, save_columnar
+from tracks import TrackStore
+
+
+@pytest.mark.parametrize("source", ["store", "dict"])
+def test_columnar_round_trip(tmp_path, source, track_store, tracked_dict):
+    path = str(tmp_path / "result.tracks")
+    save_columnar(track_store if source == "store" else tracked_dict, path)
+    assert load_tracked_data(path) == tracked_dict
+    reader = TrackReader(path)
+    assert reader.object_ids == ["ID_0", "ID_1", "ID_2"]
+    assert reader.to_tracked_data(["ID_1"]) == {"ID_1": tracked_dict["ID_1"]}
+    assert reader.object("ID_0")["frame"].tolist() == [0, 5, 10]
+
+
+def test_frames_range_is_inclusive(tmp_path, track_store):
+    path = str(tmp_path / "result.tracks")
+    save_columnar(track_store, path)
+    reader = TrackReader(path)
+    rows = reader.frames(5, 10)
+    assert sorted(zip(rows["object_id"].tolist(), rows["frame"].tolist())) == [
+        ("ID_0", 5), ("ID_0", 10), ("ID_1", 10), ("ID_2", 5)]
+    assert reader.frames(1, 4)["frame"].tolist() == []
+    assert reader.frames(0, 0)["object_id"].tolist() == ["ID_0", "ID_1"]
+    np.testing.assert_allclose(reader.frames(10, 10)["velocity_mm_s"], [9.0, 15.0])
+
+
+def test_empty_tracks(tmp_path, tracked_dict):
+    path = str(tmp_path / "empty.tracks")
+    save_columnar(TrackStore(), path)
+    reader = TrackReader(path)
+    assert reader.to_tracked_data() == {}
+    assert reader.frames(0, 100)["object_id"].tolist() == []
+
+    path = str(tmp_path / "no_rows.tracks")
+    save_columnar({"ID_0": [], "ID_1": tracked_dict["ID_1"]}, path)
+    assert load_tracked_data(path) == {"ID_0": [], "ID_1": tracked_dict["ID_1"]}
+    assert TrackReader(path).to_tracked_data([]) == {}
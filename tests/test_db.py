@@ -0,0 +1,21 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from db import make_engine
+
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:"])
+def test_memory_sqlite_uses_static_pool(url):
+    engine = make_engine(url)
+    assert isinstance(engine.pool, StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+    with engine.connect() as conn:  # Та сама база в пам'яті для наступного з'єднання
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
+
+
+def test_file_sqlite_uses_queue_pool(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    assert isinstance(engine.pool, QueuePool)
+    engine.dispose()
@@ -0,0 +1,39 @@
+import threading
+
+import numpy as np
+
+import export
+
+
+def _encode_in_thread(*args, **kwargs):
+    """encode() на окремому потоці з обмеженням часу: зависання - теж помилка тесту."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["written"] = export.encode(*args, **kwargs)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive(), "encode() завис"
+    return outcome
+
+
+def test_encode_writes_annotated_range(stop_and_go_clip, tmp_path):
+    annotations = [(50, np.array([[1, 10, 10, 20, 20]], dtype=np.int32)),
+                   (60, np.empty((0, 5), dtype=np.int32))]
+    outcome = _encode_in_thread(stop_and_go_clip, str(tmp_path / "out.mp4"), annotations, start=50, hold=5)
+    assert outcome == {"written": 15}  # Кадри 50-64: до кінця показу останнього запису
+
+
+def test_encode_raises_when_decoder_fails(stop_and_go_clip, tmp_path, monkeypatch):
+    def broken_seek(cap, frame_number, index=None):
+        raise IOError("перехід не вдався")
+
+    monkeypatch.setattr(export, "seek", broken_seek)
+    outcome = _encode_in_thread(stop_and_go_clip, str(tmp_path / "out.mp4"),
+                                [(0, np.empty((0, 5), dtype=np.int32))])
+    assert isinstance(outcome.get("error"), IOError)
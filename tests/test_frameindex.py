@@ -0,0 +1,77 @@
+import cv2
+import numpy as np
+import pytest
+
+from frameindex import FrameIndex, read_mp4_index, scan_index, seek
+
+
+def _decoded(clip):
+    cap = cv2.VideoCapture(clip)
+    frames = []
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                return frames
+            frames.append(frame)
+    finally:
+        cap.release()
+
+
+class _ImpreciseCapture:
+    """cv2.VideoCapture, у якого перехід на кадр, що не є ключовим (або на будь-який), промахується на 3 кадри."""
+
+    def __init__(self, clip, keyframes):
+        self.cap = cv2.VideoCapture(clip)
+        self.keyframes = keyframes
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES and value > 0 and value not in self.keyframes:
+            value = max(0, value - 3)
+        return self.cap.set(prop, value)
+
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
+
+
+def test_mp4_index_matches_scan(stop_and_go_clip):
+    index = read_mp4_index(stop_and_go_clip)
+    scanned = scan_index(stop_and_go_clip)
+    assert index.source == "mp4" and len(index) == len(scanned) == 180
+    np.testing.assert_allclose(index.pts, scanned.pts, atol=1e-6)
+    assert index.keyframes[0] == 0 and len(index.keyframes) > 1
+    assert np.all(np.diff(index.offsets[index.keyframes]) > 0)
+
+
+def test_index_round_trip(stop_and_go_clip):
+    index = read_mp4_index(stop_and_go_clip)
+    restored = FrameIndex.from_bytes(index.to_bytes())
+    np.testing.assert_array_equal(restored.pts, index.pts)
+    np.testing.assert_array_equal(restored.keyframes, index.keyframes)
+    np.testing.assert_array_equal(restored.offsets, index.offsets)
+    assert restored.frame_at(index.pts[37] + 1e-3) == 37
+
+
+@pytest.mark.parametrize("keyframes", ["all", "none"])
+def test_seek_lands_on_requested_frame(stop_and_go_clip, keyframes):
+    index = read_mp4_index(stop_and_go_clip)
+    frames = _decoded(stop_and_go_clip)
+    # "all" - точні переходи лише на ключові кадри (запасний шлях через GOP), "none" - промахи скрізь (з початку)
+    cap = _ImpreciseCapture(stop_and_go_clip, set(index.keyframes.tolist()) if keyframes == "all" else set())
+    try:
+        for frame_number in (0, 5, 12, 37, 100, 179, 3):
+            seek(cap, frame_number, index)
+            ret, frame = cap.read()
+            assert ret and np.array_equal(frame, frames[frame_number]), frame_number
+    finally:
+        cap.release()
+
+
+def test_seek_past_end_raises(stop_and_go_clip):
+    index = read_mp4_index(stop_and_go_clip)
+    cap = _ImpreciseCapture(stop_and_go_clip, set())
+    try:
+        with pytest.raises(IOError):
+            seek(cap, 500, index)
+    finally:
+        cap.release()
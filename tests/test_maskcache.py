@@ -0,0 +1,31 @@
+import json
+
+from config import default_settings
+from maskcache import MaskCache, cache_key
+from processor import process_video
+
+
+def _run(clip, settings, output_dir, cache, name):
+    stats = process_video(clip, settings, str(output_dir), cache=cache, name=name)
+    with open(stats["output"], encoding="utf-8") as f:
+        return stats["cached"], json.load(f)
+
+
+def test_min_contour_area_in_key_only_with_motion_gate(stop_and_go_clip):
+    settings = dict(default_settings)
+    assert cache_key(stop_and_go_clip, settings) == cache_key(stop_and_go_clip, dict(settings, min_contour_area=1))
+    gated = dict(settings, motion_threshold=8)
+    assert cache_key(stop_and_go_clip, gated) != cache_key(stop_and_go_clip, dict(gated, min_contour_area=1))
+
+
+def test_replay_with_motion_gate_matches_fresh_run(stop_and_go_clip, tmp_path):
+    cache = MaskCache(str(tmp_path / "cache"))
+    settings = dict(default_settings, motion_threshold=8)
+    # З 3000 квадрат не дає рамок, тож на зупинці кадри пропускаються; з 800 - ні
+    _run(stop_and_go_clip, dict(settings, min_contour_area=3000), tmp_path, cache, "large")
+    cached, replayed = _run(stop_and_go_clip, dict(settings, min_contour_area=800), tmp_path, cache, "small")
+    assert not cached
+    _, fresh = _run(stop_and_go_clip, dict(settings, min_contour_area=800), tmp_path, None, "fresh")
+    assert replayed == fresh
+    cached, replayed = _run(stop_and_go_clip, dict(settings, min_contour_area=800), tmp_path, cache, "again")
+    assert cached and replayed == fresh
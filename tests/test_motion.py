@@ -0,0 +1,61 @@
+import numpy as np
+
+from config import default_settings
+from motion import MIN_LEARNED_FRAMES, REFRESH_EVERY, MotionGate
+from processor import VideoProcessor, open_video
+
+
+def _background(seed=0):
+    return np.random.default_rng(seed).integers(40, 80, size=(120, 160, 3), dtype=np.uint8)
+
+
+def test_gate_ignores_noise_and_sees_objects():
+    gate = MotionGate(threshold=8)
+    frame = _background()
+    assert gate.moving(frame)  # Опорного кадру ще немає
+    gate.set_reference()
+    noise = np.random.default_rng(1).integers(-4, 5, size=frame.shape)
+    assert not gate.moving(np.clip(frame + noise, 0, 255).astype(np.uint8))
+    changed = frame.copy()
+    changed[40:80, 60:100] = 230
+    assert gate.moving(changed)
+
+
+def test_static_frames_skipped_after_learning():
+    processor = VideoProcessor(dict(default_settings, motion_threshold=8), fps=30)
+    frame = _background()
+    frames = MIN_LEARNED_FRAMES + 40
+    for _ in range(frames):
+        processor.detect(frame)  # На перших кадрах MOG2 ще вважає передним планом увесь кадр
+    assert processor.static_frames == frames - MIN_LEARNED_FRAMES
+    # На кожному REFRESH_EVERY-му статичному кадрі MOG2 все ж оновлює фон
+    assert processor._learned_frames == MIN_LEARNED_FRAMES + (frames - MIN_LEARNED_FRAMES) // REFRESH_EVERY
+
+
+def test_frames_with_objects_are_not_skipped(stop_and_go_clip):
+    settings = dict(default_settings, min_contour_area=800)
+    runs = {}
+    for threshold in (0, 8):
+        cap, fps = open_video(stop_and_go_clip)
+        processor = VideoProcessor(dict(settings, motion_threshold=threshold), fps)
+        skipped = []
+        try:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                static = processor.static_frames
+                processor.process_frame(frame)
+                if processor.static_frames > static:
+                    skipped.append(processor.frame_count - 1)
+        finally:
+            cap.release()
+        runs[threshold] = processor.tracked_data.to_dict(), skipped
+
+    (reference, _), (gated, skipped) = runs[0], runs[8]
+    assert skipped and not any(40 <= frame < 80 or frame >= 140 for frame in skipped)  # Кадри з рухом
+    assert set(gated) == set(reference)
+    for obj_id, entries in gated.items():
+        reference_frames = {entry["frame"] for entry in reference[obj_id]}
+        assert {entry["frame"] for entry in entries} <= reference_frames
+        assert len(entries) >= len(reference_frames) - 1
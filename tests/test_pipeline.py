@@ -0,0 +1,83 @@
+import threading
+
+from pipeline import FramePipeline
+
+
+def _run_bounded(pipeline, timeout=10):
+    """pipeline.run() з обмеженням часу: зависання під час зупинки - теж помилка тесту."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = pipeline.run()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "конвеєр не зупинився"
+    return outcome
+
+
+def test_frames_analysed_and_rendered_in_order(numbered_capture, recording_processor):
+    processor = recording_processor()
+    results, rendered = [], []
+    pipeline = FramePipeline(numbered_capture(50), processor, queue_size=2, drop_frames=False,
+                             render=lambda frame, visible: rendered.append(int(frame[0, 0])),
+                             on_result=lambda frame_count, visible, rows: results.append(frame_count))
+    _run_bounded(pipeline)
+    assert [value for value, _ in processor.seen] == list(range(50))
+    assert results == rendered == list(range(50))
+
+
+def test_stride_skips_frames_and_frame_limit_stops(numbered_capture, recording_processor):
+    processor = recording_processor(frame_stride=3)
+    results = []
+    pipeline = FramePipeline(numbered_capture(50), processor, frame_limit=10,
+                             on_result=lambda frame_count, visible, rows: results.append(frame_count))
+    _run_bounded(pipeline)
+    assert [value for value, _ in processor.seen] == list(range(0, 30, 3))
+    assert results == list(range(0, 30, 3))
+
+
+def test_stop_event_from_consumer_ends_run(numbered_capture, recording_processor):
+    stop_event = threading.Event()
+    capture = numbered_capture(10 ** 6)
+
+    def on_result(frame_count, visible, rows):
+        if frame_count == 20:
+            stop_event.set()
+
+    pipeline = FramePipeline(capture, recording_processor(), on_result=on_result, stop_event=stop_event,
+                             render=lambda frame, visible: None, queue_size=4)
+    _run_bounded(pipeline)
+    assert capture.position < 100  # Декодер зупинився разом зі споживачем, а не дочитав джерело
+
+
+def test_consumer_error_stops_all_stages(numbered_capture, recording_processor):
+    capture = numbered_capture(10 ** 6)
+
+    def on_result(frame_count, visible, rows):
+        if frame_count == 5:
+            raise RuntimeError("споживач впав")
+
+    pipeline = FramePipeline(capture, recording_processor(), on_result=on_result,
+                             render=lambda frame, visible: None, queue_size=4)
+    outcome = _run_bounded(pipeline)
+    assert isinstance(outcome.get("error"), RuntimeError)
+    assert pipeline.stop_event.is_set() and capture.position < 100
+
+
+def test_decoder_is_bounded_by_queue(numbered_capture, recording_processor):
+    capture = numbered_capture(200)
+    processor = recording_processor()
+    lead = []
+
+    def on_result(frame_count, visible, rows):
+        lead.append(capture.position - frame_count)  # На скільки кадрів декодер випередив аналіз
+        threading.Event().wait(0.001)
+
+    _run_bounded(FramePipeline(capture, processor, on_result=on_result, queue_size=3))
+    assert len(processor.seen) == 200
+    assert max(lead) <= 3 + 2  # Черга + кадр у руках декодера + поточний кадр
@@ -0,0 +1,54 @@
+import numpy as np
+
+from columnar import TrackReader, save_columnar
+from plotting import POINTS_PER_PIXEL, build_levels, decimate_path, series_arrays, visible_points
+
+
+def _signal(n=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(n, dtype=np.float64)
+    y = rng.normal(size=n)
+    y[12_345], y[77_777] = 50.0, -40.0  # Поодинокі піки, які не можна загубити
+    return x, y
+
+
+def test_levels_halve_and_keep_peaks():
+    x, y = _signal()
+    levels = build_levels(x, y, min_points=256)
+    assert len(levels[-1][0]) <= 256
+    for (x_prev, _), (x_next, y_next) in zip(levels, levels[1:]):
+        assert len(x_next) == 2 * -(-len(x_prev) // 4)
+        assert np.all(np.diff(x_next) >= 0)  # Порядок за X зберігається
+        assert y_next.max() == 50.0 and y_next.min() == -40.0
+        assert x_next[y_next.argmax()] == 12_345 and x_next[y_next.argmin()] == 77_777
+
+
+def test_visible_points_bounded_by_width():
+    x, y = _signal()
+    levels = build_levels(x, y)
+    vx, vy = visible_points(levels, 0, len(x) - 1, width=500)
+    assert len(vx) <= 2 * 500 * POINTS_PER_PIXEL + 2
+    assert vy.max() == 50.0 and vy.min() == -40.0
+
+    vx, vy = visible_points(levels, 1000, 1200, width=500)  # Малий діапазон - повна деталізація
+    np.testing.assert_array_equal(vx, x[999:1202])
+    np.testing.assert_array_equal(vy, y[999:1202])
+
+
+def test_decimate_path_keeps_endpoints():
+    x, y = _signal()
+    px, py = decimate_path(x, y, max_points=100)
+    assert len(px) == 100 and px[0] == x[0] and px[-1] == x[-1] and py[-1] == y[-1]
+    short_x, _ = decimate_path(x[:50], y[:50], max_points=100)
+    assert len(short_x) == 50
+
+
+def test_series_arrays_same_for_dict_and_reader(tmp_path, track_store, tracked_dict):
+    path = str(tmp_path / "result.tracks")
+    save_columnar(track_store, path)
+    from_dict = list(series_arrays(tracked_dict, "frame", "average_velocity_mm_s"))
+    from_reader = list(series_arrays(TrackReader(path), "frame", "average_velocity_mm_s"))
+    assert [obj_id for obj_id, _, _ in from_dict] == [obj_id for obj_id, _, _ in from_reader]
+    for (_, x1, y1), (_, x2, y2) in zip(from_dict, from_reader):
+        np.testing.assert_array_equal(x1, x2)
+        np.testing.assert_allclose(y1, y2)
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from config import default_settings, video_roi
+from processor import VideoProcessor, open_video
+from segments import compare_tracks, process_video_segmented, split_segments
+
+VIDEO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "176796-856056418_tiny.mp4")
+
+
+def test_split_segments_covers_all_frames():
+    bounds = split_segments(100, 3, 10)
+    assert bounds == [(0, 0, 33), (23, 33, 66), (56, 66, 100)]
+
+
+def test_split_segments_warmup_clipped_at_start():
+    assert split_segments(10, 2, 50) == [(0, 0, 5), (0, 5, 10)]
+
+
+def test_split_segments_fewer_frames_than_segments():
+    assert split_segments(2, 4, 10) == [(0, 0, 1), (0, 1, 2)]
+    assert split_segments(0, 4, 10) == []
+
+
+def _serial(filepath, settings):
+    cap, fps = open_video(filepath)
+    try:
+        return VideoProcessor(settings, fps, video_roi(settings, filepath)).run(cap)
+    finally:
+        cap.release()
+
+
+@pytest.mark.skipif(not os.path.exists(VIDEO), reason="немає тестового відео")
+def test_segmented_matches_serial():
+    settings = dict(default_settings)
+    tracked_data, _ = process_video_segmented(VIDEO, settings, segments=3, warmup=150)
+    # Після розігріву на 150 кадрах рамки зсуваються до 4 px, але ID і кадри вибірки - ті самі
+    assert compare_tracks(_serial(VIDEO, settings), tracked_data, tolerance_mm=None) == []
+
+
+def test_segment_seams_within_one_pixel(stop_and_go_clip):
+    settings = dict(default_settings, min_contour_area=800)
+    serial = _serial(stop_and_go_clip, settings)
+    tracked_data, frames = process_video_segmented(stop_and_go_clip, settings, segments=3, warmup=60)
+    assert frames == 180
+    assert compare_tracks(serial, tracked_data) == []
+
+
+def test_full_warmup_reproduces_serial_exactly(stop_and_go_clip):
+    settings = dict(default_settings, min_contour_area=800)
+    # Розігрів від початку файлу - стан MOG2 на межах такий самий, як у послідовній обробці
+    tracked_data, _ = process_video_segmented(stop_and_go_clip, settings, segments=3, warmup=180)
+    assert tracked_data.to_dict() == _serial(stop_and_go_clip, settings).to_dict()
@@ -0,0 +1,120 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import func, select
+
+import storage
+from models import ProcessedVideo, TrackSummary, Video
+
+
+def _row(frame, x, displacement, average):
+    return ("ID_0", frame, x, 0.0, displacement, average, 1.0)
+
+
+def test_max_velocity_is_peak_speed_between_samples(memory_db):
+    writer = storage.ResultWriter(1, batch_size=2, replace=False, fps=10)
+    # 5 кадрів між вибірками = 0.5 с: 1 мм -> 2 мм/с, 10 мм -> 20 мм/с (другий пакет), 2 мм -> 4 мм/с
+    writer.add([_row(0, 0.0, 0.0, 5.0), _row(5, 1.0, 1.0, 5.0)])
+    writer.add([_row(10, 11.0, 10.0, 6.0), _row(15, 13.0, 2.0, 6.5)])
+    writer.close()
+    (summary,) = storage.fastest_objects(1)
+    assert summary.max_velocity == pytest.approx(20.0)
+    assert summary.mean_velocity == pytest.approx(6.5)
+    assert summary.samples == 4
+    assert summary.path_length == pytest.approx(13.0)
+
+
+def test_range_run_does_not_replace_whole_video_results(memory_db, tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"")
+    full_id = storage.register_video(str(video))
+    range_id = storage.register_video(str(video), start=100, end=200)
+    assert range_id != full_id
+    assert storage.register_video(str(video), start=100, end=200) == range_id
+    assert storage.register_video(str(video)) == full_id
+
+    with storage.ResultWriter(full_id) as writer:
+        writer.add([_row(0, 0.0, 0.0, 0.0), _row(300, 1.0, 1.0, 1.0)])
+    with storage.ResultWriter(range_id) as writer:  # replace=True - лише для записів цього діапазону
+        writer.add([_row(150, 0.0, 0.0, 0.0)])
+    with memory_db.connect() as conn:
+        counts = dict(conn.execute(select(ProcessedVideo.video_id, func.count())
+                                   .group_by(ProcessedVideo.video_id)).all())
+    assert counts == {full_id: 2, range_id: 1}
+
+
+def test_find_object_searches_range_records_without_inserting(memory_db, tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"")
+    assert storage.find_object(str(video), "ID_0") is None
+    with memory_db.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Video)).scalar() == 0
+
+    with storage.ResultWriter(storage.register_video(str(video), start=100)) as writer:
+        writer.add([_row(150, 0.0, 0.0, 0.0), _row(155, 1.0, 1.0, 1.0)])
+    assert storage.find_object(str(video), "ID_0") == (150, 155)
+
+    with storage.ResultWriter(storage.register_video(str(video))) as writer:  # Усе відео - має перевагу
+        writer.add([_row(10, 0.0, 0.0, 0.0)])
+    assert storage.find_object(str(video), "ID_0") == (10, 10)
+    assert storage.find_object(str(video), "ID_9") is None
+
+
+def test_portable_summary_merge_matches_upsert(memory_db):
+    batches = [[_row(0, 0.0, 0.0, 5.0), _row(5, 1.0, 1.0, 5.0)], [_row(10, 11.0, 10.0, 6.0)],
+               [_row(15, 13.0, 2.0, 6.5), ("ID_1", 15, 4.0, 2.0, 0.0, 0.0, 1.0)]]
+    with storage.ResultWriter(1, batch_size=1, replace=False, fps=10) as writer:
+        for rows in batches:
+            writer.add(rows)
+    last_frames = {}
+    for rows in batches:
+        with memory_db.begin() as conn:
+            buffer = [{"video_id": 2, "object_id": obj_id, "frame_number": frame, "x_position": x,
+                       "y_position": y, "displacement": displacement, "velocity": velocity}
+                      for obj_id, frame, x, y, displacement, velocity, _ in rows]
+            storage._merge_summaries(conn, storage._summarize(buffer, 10, last_frames))
+
+    with memory_db.connect() as conn:
+        summaries = conn.execute(select(TrackSummary).order_by(TrackSummary.video_id, TrackSummary.object_id)).all()
+    upserted = [row[1:] for row in summaries if row.video_id == 1]
+    merged = [row[1:] for row in summaries if row.video_id == 2]
+    assert len(upserted) == 2 and merged == upserted
+
+
+def _stored_rows(engine, video_id):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(ProcessedVideo)
+                            .where(ProcessedVideo.video_id == video_id)).scalar()
+
+
+def test_writer_flushes_in_batches(memory_db):
+    writer = storage.ResultWriter(1, batch_size=4, replace=False)
+    writer.add([_row(frame, 0.0, 0.0, 0.0) for frame in range(3)])
+    assert len(writer.buffer) == 3 and _stored_rows(memory_db, 1) == 0  # Буфер ще не заповнений
+    writer.add([_row(frame, 0.0, 0.0, 0.0) for frame in range(3, 5)])
+    assert writer.buffer == [] and writer.rows_written == 5 and _stored_rows(memory_db, 1) == 5
+    writer.add([_row(5, 0.0, 0.0, 0.0)])
+    writer.close()  # Залишок скидається при закритті
+    assert writer.rows_written == 6 and _stored_rows(memory_db, 1) == 6
+
+
+def test_writer_flush_interval(memory_db, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(storage.time, "monotonic", lambda: now[0])
+    writer = storage.ResultWriter(1, batch_size=1000, replace=False, flush_interval=5.0)
+    writer.add([_row(0, 0.0, 0.0, 0.0)])
+    assert _stored_rows(memory_db, 1) == 0
+    now[0] += 5.0
+    writer.add([_row(5, 0.0, 0.0, 0.0)])
+    assert _stored_rows(memory_db, 1) == 2
+
+
+def test_writer_replace_clears_only_its_video(memory_db):
+    for video_id in (1, 2):
+        with storage.ResultWriter(video_id) as writer:
+            writer.add([_row(0, 0.0, 0.0, 0.0), _row(5, 1.0, 1.0, 1.0)])
+    with storage.ResultWriter(1) as writer:
+        writer.add([_row(0, 0.0, 0.0, 0.0)])
+    assert _stored_rows(memory_db, 1) == 1 and _stored_rows(memory_db, 2) == 2
+    assert storage.fastest_objects(1)[0].samples == 1
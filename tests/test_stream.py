@@ -0,0 +1,44 @@
+import json
+import threading
+
+from config import default_settings
+from pipeline import FramePipeline
+from stream import LatestFrameGrabber, monitor
+
+
+def test_live_pipeline_labels_frames_with_source_numbers(numbered_capture, recording_processor):
+    grabber = LatestFrameGrabber(numbered_capture(60), simulate_fps=200)
+    processor = recording_processor(frame_stride=3)
+    try:
+        FramePipeline(grabber, processor, live=True).run()
+    finally:
+        grabber.release()
+    assert processor.seen
+    assert all(value == frame_number for value, frame_number in processor.seen)
+    numbers = [frame_number for _, frame_number in processor.seen]
+    assert numbers == sorted(set(numbers))
+    assert len(numbers) > 60 // 3  # frame_stride не проріджує живе джерело вдруге
+
+
+def test_monitor_simulated_stream(stop_and_go_clip, tmp_path, memory_db):
+    from sqlalchemy import func, select
+
+    from models import ProcessedVideo
+
+    stop_event = threading.Event()
+    timer = threading.Timer(20.0, stop_event.set)  # Запобіжник: кліп триває 6 с
+    timer.start()
+    try:
+        stats = monitor(stop_and_go_clip, dict(default_settings, min_contour_area=800), str(tmp_path),
+                        store=True, simulate=True, flush_interval=0.5, stop_event=stop_event)
+    finally:
+        timer.cancel()
+    assert stats["ended"]
+    assert stats["rows"] > 0
+    with open(stats["output"], encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == stats["rows"]
+    frames = [row["frame"] for row in rows if row["object_id"] == rows[0]["object_id"]]
+    assert frames == sorted(frames) and len(set(frames)) == len(frames)
+    with memory_db.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(ProcessedVideo)).scalar() == stats["rows"]
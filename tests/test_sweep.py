@@ -0,0 +1,20 @@
+import pytest
+
+from config import default_settings
+from processor import VideoProcessor, open_video
+from sweep import expand_grid, run_sweep, track_stats
+
+
+@pytest.mark.parametrize("motion_threshold", [0, 8])
+def test_sweep_matches_separate_runs(stop_and_go_clip, motion_threshold):
+    configs = expand_grid(dict(default_settings, motion_threshold=motion_threshold),
+                          {"min_contour_area": [800, 3000], "match_distance": [30, 50]})
+    results, run_stats = run_sweep(stop_and_go_clip, configs)
+    assert run_stats["mask_groups"] == (1 if motion_threshold == 0 else 2)
+    for config, result in zip(configs, results):
+        cap, fps = open_video(stop_and_go_clip)
+        try:
+            tracked_data = VideoProcessor(config, fps).run(cap)
+        finally:
+            cap.release()
+        assert (result["tracks"], result["mean_track_s"], result["mean_samples"]) == track_stats(tracked_data, fps)
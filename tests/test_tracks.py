@@ -0,0 +1,20 @@
+from tracks import TrackStore
+
+
+def test_track_store_behaves_like_dict(track_store, tracked_dict):
+    assert track_store.to_dict() == tracked_dict
+    assert len(track_store) == 3 and list(track_store) == ["ID_0", "ID_1", "ID_2"]
+    assert "ID_2" in track_store and "ID_9" not in track_store
+    assert track_store["ID_0"] == tracked_dict["ID_0"]
+    frame, _, _, objects = track_store.columns()
+    assert objects == {"ID_0": [0, 3], "ID_1": [3, 5], "ID_2": [5, 6]}
+    assert frame.tolist() == [0, 5, 10, 0, 10, 5]
+
+
+def test_track_store_grows_in_batches(track_rows, tracked_dict):
+    store = TrackStore(capacity=1)
+    store.append_rows(track_rows)
+    store.append_rows(track_rows[:2])
+    assert store.size == len(track_rows) + 2 and len(store.frame) == 8
+    assert store.to_dict()["ID_1"][-1] == tracked_dict["ID_1"][0]
+    assert TrackStore().to_dict() == {} and len(TrackStore()) == 0
@@ -0,0 +1,107 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+CHUNK_SIZE = 4096  # Початкова місткість сховища (рядків)
+
+# Поля рядка tracked_data у порядку стовпців сховища
+FIELDS = ("frame", "x_mm", "y_mm", "displacement_mm", "average_velocity_mm_s")
+
+
+class TrackedObject:
+    """Стан об'єкта, який зараз відстежується (замість словника з рядковими ключами)."""
+
+    __slots__ = ("coords", "prev_coords", "size_mm", "velocity", "total_velocity", "velocity_count",
+                 "start_time", "last_seen", "visible")
+
+    def __init__(self, coords, size_mm, current_time):
+        self.coords = coords
+        self.prev_coords = None  # Координати на попередньому вибірковому кадрі
+        self.size_mm = size_mm
+        self.velocity = 0
+        self.total_velocity = 0
+        self.velocity_count = 0
+        self.start_time = current_time
+        self.last_seen = current_time
+        self.visible = False
+
+
+class TrackStore(Mapping):
+    """Компактне сховище tracked_data на типізованих масивах, що ростуть блоками.
+
+    Кожен рядок займає 4 + 4 + 4 * 8 байт замість окремого словника. Зовні поводиться як
+    словник {obj_id: [{"frame": ..., "x_mm": ..., ...}, ...]} - списки рядків
+    будуються лише на запит (to_dict(), store[obj_id]).
+    """
+
+    def __init__(self, capacity=CHUNK_SIZE):
+        self.object_ids = []
+        self._object_index = {}
+        self.size = 0
+        self.frame = np.empty(capacity, dtype=np.int32)
+        self.object = np.empty(capacity, dtype=np.int32)
+        self.values = np.empty((capacity, len(FIELDS) - 1), dtype=np.float64)
+
+    def _reserve(self, extra):
+        capacity = len(self.frame)
+        if self.size + extra <= capacity:
+            return
+        while capacity < self.size + extra:
+            capacity *= 2
+        for name in ("frame", "object", "values"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def append_rows(self, rows):
+        """Додає пакет рядків (obj_id, frame, x_mm, y_mm, displacement_mm, average_velocity_mm_s)."""
+        self._reserve(len(rows))
+        for obj_id, frame, *values in rows:
+            index = self._object_index.get(obj_id)
+            if index is None:
+                index = self._object_index[obj_id] = len(self.object_ids)
+                self.object_ids.append(obj_id)
+            self.frame[self.size] = frame
+            self.object[self.size] = index
+            self.values[self.size] = values
+            self.size += 1
+
+    def _rows_of(self, index):
+        return np.flatnonzero(self.object[:self.size] == index)
+
+    def _entries(self, rows):
+        frames = self.frame[rows].tolist()
+        values = self.values[rows].tolist()
+        return [dict(zip(FIELDS, (frame, *row))) for frame, row in zip(frames, values)]
+
+    def __getitem__(self, obj_id):
+        return self._entries(self._rows_of(self._object_index[obj_id]))
+
+    def __iter__(self):
+        return iter(self.object_ids)
+
+    def __len__(self):
+        return len(self.object_ids)
+
+    def __contains__(self, obj_id):
+        return obj_id in self._object_index
+
+    def columns(self):
+        """Рядки, впорядковані за об'єктом: (frame, object, values, {obj_id: [start, stop]})."""
+        order = np.argsort(self.object[:self.size], kind="stable")
+        counts = np.bincount(self.object[:self.size], minlength=len(self.object_ids))
+        bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+        objects = {obj_id: [bounds[i], bounds[i + 1]] for i, obj_id in enumerate(self.object_ids)}
+        return self.frame[order], self.object[order], self.values[order], objects
+
+    def to_dict(self):
+        """Експорт у звичну структуру tracked_data (для JSON)."""
+        frame, _, values, objects = self.columns()
+        frames, values = frame.tolist(), values.tolist()
+        return {obj_id: [dict(zip(FIELDS, (frames[i], *values[i]))) for i in range(start, stop)]
+                for obj_id, (start, stop) in objects.items()}
+
+    @property
+    def nbytes(self):
+        return self.frame.nbytes + self.object.nbytes + self.values.nbytes
@@ -1,12 +1,11 @@
+import multiprocessing
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import messagebox, Toplevel
-from sqlalchemy.orm import sessionmaker
-from db import engine
+from db import SessionLocal, ensure_schema
 from models import User
 from Var3 import create_gui  # Імпортуємо основне вікно програми
 
-SessionLocal = sessionmaker(bind=engine)
 def register_window():
     """Вікно реєстрації нового користувача"""
     reg_app = ttk.Window(themename="darkly")
@@ -43,6 +42,7 @@ def register_window():
             messagebox.showwarning("Помилка", "Заповніть всі поля!")
             return
 
+        ensure_schema()  # Таблиці створюються лише при першому запуску або після оновлення схеми
         session = SessionLocal()
         existing_user = session.query(User).filter(User.email == email).first()
 
@@ -97,6 +97,7 @@ def login_window():
             messagebox.showwarning("Помилка", "Заповніть всі поля!")
             return
 
+        ensure_schema()
         session = SessionLocal()
         user = session.query(User).filter(User.email == email).first()
         session.close()
@@ -119,4 +120,6 @@ def login_window():
 
     login_app.mainloop()
 
-login_window()
+if __name__ == "__main__":  # Процес кодування відео (spawn) імпортує головний модуль повторно
+    multiprocessing.freeze_support()  # Для збірки у виконуваний файл (cx_Freeze)
+    login_window()